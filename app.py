@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
 import threading
 import queue
@@ -18,9 +18,14 @@ from scanners.macd_scanner_original import MACDScannerOriginal
 from scanners.range_breakout_scanner import RangeBreakoutScanner
 from scanners.resistance_breakout_scanner import ResistanceBreakoutScanner
 from scanners.support_level_scanner import SupportLevelScanner
-from utils.market_indices import MarketIndices
+from utils.market_indices import get_indices_snapshot
 from utils.data_fetcher import DataFetcher
-from datetime import datetime, timedelta
+from utils.bar_store import get_bar_store
+from utils.data_quality import get_data_quality
+from utils.fetch_executor import get_fetch_executor
+from utils.indicator_cache import get_indicator_cache
+from utils.resilience import get_resilient_caller
+from utils.scan_scheduler import BarCloseScheduler, SETTLE_SECONDS
 from streamlit_autorefresh import st_autorefresh
 
 
@@ -40,6 +45,8 @@ if 'last_scan_time' not in st.session_state:
     st.session_state.last_scan_time = None
 if 'scan_results' not in st.session_state:
     st.session_state.scan_results = {}
+if 'last_run_times' not in st.session_state:
+    st.session_state.last_run_times = {}  # scanner name -> last run time
 if 'auto_scan_enabled' not in st.session_state:
     st.session_state.auto_scan_enabled = True
 if 'scan_interval' not in st.session_state:
@@ -57,6 +64,56 @@ if 'active_scanners' not in st.session_state:
 # IST timezone
 IST = pytz.timezone('Asia/Kolkata')
 
+# Bar interval whose close triggers each scanner
+SCANNER_TIMEFRAMES = {
+    "MACD 15min": "15m",
+    "MACD 4h": "4h",
+    "MACD 1d": "1d",
+    "Range Breakout 4h": "4h",
+    "Resistance Breakout 4h": "4h",
+    "Support Level 4h": "4h"
+}
+
+@st.cache_resource
+def warm_start_bar_store():
+    """Load cached history from disk once per process so the first scan only fetches new bars"""
+    return get_bar_store().warm_start()
+
+warm_start_bar_store()
+
+@st.cache_resource
+def get_quote_fetcher():
+    """Get the data fetcher serving live quotes, built once per process"""
+    return DataFetcher()
+
+def add_live_quotes(results):
+    """
+    Add the latest price and day change of each row's symbol
+    
+    Quotes for the whole table come from one batched snapshot, cached for
+    a few seconds (see utils.quote_cache), so the table follows the market
+    between scans without a request per row.
+    
+    Args:
+        results: Scanner results DataFrame with a Symbol column
+        
+    Returns:
+        DataFrame with Live_Price and Live_Change_% columns added
+    """
+    if 'Symbol' not in results.columns or results.empty:
+        return results
+    
+    try:
+        quotes = get_quote_fetcher().get_quote_snapshot(results['Symbol'].unique().tolist())
+    except Exception as e:
+        print(f"Error fetching live quotes: {e}")
+        return results
+    
+    results = results.copy()
+    results['Live_Price'] = results['Symbol'].map(quotes['price']).round(2)
+    results['Live_Change_%'] = results['Symbol'].map(quotes['change_percent']).round(2)
+    return results
+
 def get_ist_time():
     """Get current time in IST"""
     return datetime.now(IST)
@@ -71,6 +128,38 @@ def check_market_hours_ist():
 
 
 
+def get_scan_scheduler():
+    """Get the bar-close scheduler for this session's scan interval"""
+    timeframes = dict(SCANNER_TIMEFRAMES)
+    
+    # The intraday scanner runs on the close of every scan-interval bar (15m, 30m or 60m)
+    timeframes["MACD 15min"] = f"{max(st.session_state.scan_interval, 15)}m"
+    
+    return BarCloseScheduler(timeframes, settle_seconds=SETTLE_SECONDS)
+
+def get_active_scanner_names():
+    """Get the names of the enabled scanners"""
+    return [name for name, active in st.session_state.active_scanners.items() if active]
+
+def format_countdown(container, current_time):
+    """Write the time until the next scheduled scan into a container"""
+    next_scan = get_scan_scheduler().next_run(get_active_scanner_names(), current_time)
+    
+    if next_scan is None:
+        container.write("**Next Scan:** No active scanners")
+        return
+    
+    time_to_next = next_scan - current_time
+    
+    if time_to_next.total_seconds() > 0:
+        minutes_left = int(time_to_next.total_seconds() / 60)
+        seconds_left = int(time_to_next.total_seconds() % 60)
+        container.write(f"**Next Scan:** {minutes_left}m {seconds_left}s ({next_scan.strftime('%H:%M:%S')})")
+    else:
+        container.write("**Next Scan:** ⏰ Due now")
+
+
+
 def main():
     st_autorefresh(interval=60 * 1000, key="refresh")
     # Fresh modern UI header
@@ -176,8 +265,8 @@ def display_market_indices():
     st.markdown("### 📊 Live Market Indices")
     
     try:
-        market_indices = MarketIndices()
-        indices_data = market_indices.get_live_indices()
+        # Shared snapshot, refreshed in the background once its TTL has passed
+        indices_data = get_indices_snapshot().get()
         
         if not indices_data.empty:
             # Create responsive columns
@@ -253,6 +342,9 @@ def display_individual_scanner_results(scanner_name):
             ascending = sort_order == "Ascending"
             sorted_results = results.sort_values(by=sort_by, ascending=ascending).head(max_results)
             
+            # Latest quotes for the rows shown
+            sorted_results = add_live_quotes(sorted_results)
+            
             # Display results table
             st.dataframe(
                 sorted_results,
@@ -298,22 +390,11 @@ def display_status_panel():
         st.success("✅ Auto-scan ENABLED")
         st.write(f"**Interval:** {st.session_state.scan_interval} minutes")
         
-        # Next scan countdown
+        # Next scan countdown (scanners run on the bar closes of their timeframe)
         if st.session_state.last_scan_time:
-            # FIXED: Use minimum 15-minute intervals
-            actual_interval = max(st.session_state.scan_interval, 15)
-            next_scan = st.session_state.last_scan_time + timedelta(minutes=actual_interval)
-            time_to_next = next_scan - current_time
-            
             # Create a container for the countdown
             countdown_container = st.empty()
-            
-            if time_to_next.total_seconds() > 0:
-                minutes_left = int(time_to_next.total_seconds() / 60)
-                seconds_left = int(time_to_next.total_seconds() % 60)
-                countdown_container.write(f"**Next Scan:** {minutes_left}m {seconds_left}s")
-            else:
-                countdown_container.write("**Next Scan:** ⏰ Due now")
+            format_countdown(countdown_container, current_time)
     else:
         st.info("⏸️ Auto-scan DISABLED")
     
@@ -338,6 +419,24 @@ def display_status_panel():
     active_count = sum(1 for active in st.session_state.active_scanners.values() if active)
     st.metric("🔧 Active Scanners", f"{active_count}/6")
     
+    # Data feed health from the shared fetch executor
+    fetch_stats = get_fetch_executor().stats()
+    st.write(f"**Fetch Latency:** {fetch_stats['avg_latency'] * 1000:.0f} ms avg / {fetch_stats['p95_latency'] * 1000:.0f} ms p95")
+    st.write(f"**Fetch Queue:** {fetch_stats['queue_depth']} queued, {fetch_stats['in_flight']} in flight")
+    
+    cache_stats = get_indicator_cache().stats()
+    st.write(f"**Indicator Cache:** {cache_stats['hit_rate']:.0%} hits, {cache_stats['entries']} entries")
+    
+    open_circuits = [host for host, state in get_resilient_caller().states().items() if state != 'closed']
+    if open_circuits:
+        st.warning(f"⚠️ Data source unavailable ({', '.join(open_circuits)}) - serving cached bars")
+    
+    # Data quality flags from the last validation of each series
+    flagged = get_data_quality().report(flagged_only=True)
+    if not flagged.empty:
+        with st.expander(f"🩺 Data Quality: {flagged['symbol'].nunique()} symbols flagged"):
+            st.dataframe(flagged, use_container_width=True, hide_index=True)
+    
     # Return the containers that need to be updated
     if st.session_state.auto_scan_enabled and st.session_state.last_scan_time:
         return time_since_container, countdown_container
@@ -359,16 +458,7 @@ def update_counters(time_since_container, countdown_container):
         time_since_container.write(f"**Time Since:** {minutes_ago}m {seconds_ago}s")
     
     if countdown_container and st.session_state.last_scan_time and st.session_state.auto_scan_enabled:
-        actual_interval = max(st.session_state.scan_interval, 15)
-        next_scan = st.session_state.last_scan_time + timedelta(minutes=actual_interval)
-        time_to_next = next_scan - current_time
-        
-        if time_to_next.total_seconds() > 0:
-            minutes_left = int(time_to_next.total_seconds() / 60)
-            seconds_left = int(time_to_next.total_seconds() % 60)
-            countdown_container.write(f"**Next Scan:** {minutes_left}m {seconds_left}s")
-        else:
-            countdown_container.write("**Next Scan:** ⏰ Due now")
+        format_countdown(countdown_container, current_time)
     
     # Schedule the next update in 1 second
     time.sleep(1)
@@ -380,10 +470,22 @@ def update_counters(time_since_container, countdown_container):
 
 
 
-def run_all_scanners():
-    """Run all enabled scanners and send Telegram notifications if enabled"""
+def run_all_scanners(scanner_names=None):
+    """
+    Run enabled scanners and send Telegram notifications if enabled
+    
+    Args:
+        scanner_names: Scanners to run (defaults to all enabled scanners);
+                       results of the others are kept from their last run
+    """
     with st.spinner("🔄 Running active scanners..."):
         try:
+            # Drop bars whose candle has closed so this cycle fetches each series once
+            get_bar_store().purge_expired()
+            
+            active = get_active_scanner_names()
+            to_run = active if scanner_names is None else [name for name in scanner_names if name in active]
+            
             # Initialize scanners
             macd_scanner_original = MACDScannerOriginal()
             range_scanner = RangeBreakoutScanner()
@@ -393,32 +495,40 @@ def run_all_scanners():
             # Run scanners based on active selections
             scan_results = {}
             
-            if st.session_state.active_scanners["MACD 15min"]:
+            if "MACD 15min" in to_run:
                 scan_results["MACD 15min"] = macd_scanner_original.scan(timeframe="15m")
             
-            if st.session_state.active_scanners["MACD 4h"]:
+            if "MACD 4h" in to_run:
                 scan_results["MACD 4h"] = macd_scanner_original.scan(timeframe="4h")
             
-            if st.session_state.active_scanners["MACD 1d"]:
+            if "MACD 1d" in to_run:
                 scan_results["MACD 1d"] = macd_scanner_original.scan(timeframe="1d")
             
-            if st.session_state.active_scanners["Range Breakout 4h"]:
+            if "Range Breakout 4h" in to_run:
                 scan_results["Range Breakout 4h"] = range_scanner.scan(timeframe="4h")
             
-            if st.session_state.active_scanners["Resistance Breakout 4h"]:
+            if "Resistance Breakout 4h" in to_run:
                 scan_results["Resistance Breakout 4h"] = resistance_scanner.scan(timeframe="4h")
             
-            if st.session_state.active_scanners["Support Level 4h"]:
+            if "Support Level 4h" in to_run:
                 scan_results["Support Level 4h"] = support_scanner.scan(timeframe="4h")
             
-            # Update session state with results
-            st.session_state.scan_results = scan_results
+            # Update session state with results, keeping other active scanners' last results
+            run_time = get_ist_time()
+            for name in scan_results:
+                st.session_state.last_run_times[name] = run_time
+            
+            st.session_state.scan_results = {
+                name: scan_results.get(name, st.session_state.scan_results.get(name))
+                for name in active
+                if name in scan_results or name in st.session_state.scan_results
+            }
             #for name, df in scan_results.items():
                 #if isinstance(df, pd.DataFrame):
                     #st.write(f"🔍 Scanner: {name}")
                     #st.dataframe(df.head())
 
-            st.session_state.last_scan_time = get_ist_time()
+            st.session_state.last_scan_time = run_time
             
             # Send Telegram notification if enabled and there are results
             if (st.session_state.notification_enabled and 
@@ -572,12 +682,11 @@ def send_telegram_notification(scan_results):
 
 
 def handle_auto_scan():
-    current_time = get_ist_time()
-    interval_minutes = max(st.session_state.scan_interval, 15)
-    next_scan_time = st.session_state.last_scan_time + timedelta(minutes=interval_minutes)
+    """Run the scanners whose timeframe closed a bar since their last run"""
+    due = get_scan_scheduler().due(st.session_state.last_run_times, get_active_scanner_names())
 
-    if current_time >= next_scan_time:
-        run_all_scanners()
+    if due:
+        run_all_scanners(due)
 
 
 def export_results():
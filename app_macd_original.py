@@ -23,6 +23,7 @@ import os
 import requests
 from datetime import datetime
 from zoneinfo import ZoneInfo
+from scanners.macd_scanner_original import MACDScannerOriginal
 
 # Page configuration with fresh modern theme
 st.set_page_config(
@@ -172,60 +173,11 @@ def is_trading_hours():
 
 def calculate_ema(data, period):
     """Calculate Exponential Moving Average exactly like Google Apps Script"""
-    k = 2 / (period + 1)
-    ema_array = [data[0]]
-
-    for i in range(1, len(data)):
-        ema_value = data[i] * k + ema_array[i - 1] * (1 - k)
-        ema_array.append(ema_value)
-
-    return ema_array
+    return MACDScannerOriginal.calculate_ema(data, period)
 
 def calculate_macd(close_prices):
     """Calculate MACD exactly like the Google Apps Script reference"""
-    if len(close_prices) < 30:
-        return None
-
-    # Calculate EMAs using the exact same logic as Google Apps Script
-    fast_ema = calculate_ema(close_prices, 12)
-    slow_ema = calculate_ema(close_prices, 26)
-
-    # MACD line
-    macd_line = [fast_ema[i] - slow_ema[i] for i in range(len(fast_ema))]
-
-    # Signal line (9-period EMA of MACD line)
-    signal_line = calculate_ema(macd_line, 9)
-
-    # Histogram (latest values)
-    histogram = macd_line[-1] - signal_line[-1]
-
-    # Generate signals using exact same logic as Google Apps Script
-    signals = []
-    for i in range(len(macd_line)):
-        macd_val = macd_line[i]
-        signal_val = signal_line[i]
-
-        if macd_val > signal_val and macd_val > 0 and signal_val > 0:
-            signals.append("STRONG BUY")
-        elif macd_val < signal_val and macd_val < 0 and signal_val < 0:
-            signals.append("STRONG SELL")
-        elif macd_val > signal_val and macd_val < 0:
-            signals.append("WEAK BUY")
-        elif macd_val < signal_val and macd_val > 0:
-            signals.append("WEAK SELL")
-        elif macd_val > signal_val:
-            signals.append("BUY")
-        elif macd_val < signal_val:
-            signals.append("SELL")
-        else:
-            signals.append("NO SIGNAL")
-
-    return {
-        'macd': macd_line[-1],
-        'signal': signal_line[-1],
-        'histogram': histogram,
-        'signals': signals
-    }
+    return MACDScannerOriginal.calculate_macd(close_prices)
 
 def generate_sound_alert():
     """Generate sound alert for new detections"""
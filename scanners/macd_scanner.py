@@ -1,13 +1,15 @@
 import pandas as pd
 import numpy as np
 from utils.data_fetcher import DataFetcher
+from utils.sharding import get_shard_runner
+from utils.panel_indicators import BarPanel, PanelIndicators
 from utils.technical_indicators import TechnicalIndicators
 
 class MACDScanner:
     """MACD Scanner with 15-minute intervals for momentum analysis"""
     
-    def __init__(self):
-        self.data_fetcher = DataFetcher()
+    def __init__(self, provider=None):
+        self.data_fetcher = DataFetcher(provider)
         self.tech_indicators = TechnicalIndicators()
         
     def scan(self, timeframe="15m", lookback_days=30):
@@ -24,55 +26,11 @@ class MACDScanner:
         try:
             # Get NSE stock list
             symbols = self.data_fetcher.get_nse_stock_list()
-            results = []
             
-            for symbol in symbols[:100]:  # Limit to first 100 for performance
-                try:
-                    # Fetch data
-                    data = self.data_fetcher.get_stock_data(
-                        symbol, 
-                        period=f"{lookback_days}d",
-                        interval=timeframe
-                    )
-                    
-                    if data is None or len(data) < 50:
-                        continue
-                    
-                    # Calculate MACD
-                    macd_data = self.tech_indicators.calculate_macd(
-                        data['Close'], 
-                        fast=12, 
-                        slow=26, 
-                        signal=9
-                    )
-                    
-                    # Check for MACD signals
-                    signal = self.detect_macd_signal(macd_data)
-                    
-                    if signal['type'] != 'none':
-                        # Get current price info
-                        current_price = data['Close'].iloc[-1]
-                        volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
-                        
-                        # Calculate additional metrics
-                        price_change = ((current_price - data['Close'].iloc[-2]) / data['Close'].iloc[-2]) * 100
-                        
-                        results.append({
-                            'Symbol': symbol,
-                            'Signal': signal['type'],
-                            'MACD': round(macd_data['MACD'].iloc[-1], 4),
-                            'Signal_Line': round(macd_data['Signal'].iloc[-1], 4),
-                            'Histogram': round(macd_data['Histogram'].iloc[-1], 4),
-                            'Current_Price': round(current_price, 2),
-                            'Price_Change_%': round(price_change, 2),
-                            'Volume': int(volume),
-                            'Strength': signal['strength'],
-                            'Timeframe': timeframe
-                        })
-                        
-                except Exception as e:
-                    print(f"Error processing {symbol}: {e}")
-                    continue
+            # Scan the universe in parallel shards
+            results = get_shard_runner().run(
+                symbols, lambda shard: self._scan_shard(shard, timeframe, lookback_days)
+            )
             
             return pd.DataFrame(results)
             
@@ -80,6 +38,77 @@ class MACDScanner:
             print(f"Error in MACD scanner: {e}")
             return pd.DataFrame()
     
+    def _scan_shard(self, symbols, timeframe, lookback_days):
+        """
+        Scan one shard of symbols for MACD signals
+        
+        Args:
+            symbols: List of stock symbols
+            timeframe: Data timeframe
+            lookback_days: Number of days to look back
+            
+        Returns:
+            List of signal rows
+        """
+        results = []
+        
+        # Fetch the shard's symbols in batched requests
+        stock_data = self.data_fetcher.get_multiple_stocks_data(
+            symbols,
+            period=f"{lookback_days}d",
+            interval=timeframe
+        )
+        
+        # Calculate MACD for the whole shard in one vectorized call
+        panel = BarPanel.from_frames(stock_data)
+        macd_line, signal_line, histogram = PanelIndicators.calculate_macd(panel.close, fast=12, slow=26, signal=9)
+        
+        for symbol, data in stock_data.items():
+            try:
+                if len(data) < 50:
+                    continue
+                
+                # Skip series whose last candles are frozen (see utils.data_quality)
+                if data.attrs.get('quality', {}).get('frozen'):
+                    continue
+                
+                # This symbol's rows of the panel MACD
+                macd_data = pd.DataFrame({
+                    'MACD': panel.row(symbol, macd_line),
+                    'Signal': panel.row(symbol, signal_line),
+                    'Histogram': panel.row(symbol, histogram)
+                }, index=data.index)
+                
+                # Check for MACD signals
+                signal = self.detect_macd_signal(macd_data)
+                
+                if signal['type'] != 'none':
+                    # Get current price info
+                    current_price = data['Close'].iloc[-1]
+                    volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
+                    
+                    # Calculate additional metrics
+                    price_change = ((current_price - data['Close'].iloc[-2]) / data['Close'].iloc[-2]) * 100
+                    
+                    results.append({
+                        'Symbol': symbol,
+                        'Signal': signal['type'],
+                        'MACD': round(macd_data['MACD'].iloc[-1], 4),
+                        'Signal_Line': round(macd_data['Signal'].iloc[-1], 4),
+                        'Histogram': round(macd_data['Histogram'].iloc[-1], 4),
+                        'Current_Price': round(current_price, 2),
+                        'Price_Change_%': round(price_change, 2),
+                        'Volume': int(volume),
+                        'Strength': signal['strength'],
+                        'Timeframe': timeframe
+                    })
+                    
+            except Exception as e:
+                print(f"Error processing {symbol}: {e}")
+                continue
+        
+        return results
+    
     def detect_macd_signal(self, macd_data):
         """
         Detect MACD signals
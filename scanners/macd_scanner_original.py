@@ -1,15 +1,21 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import pytz
+from utils.indicator_cache import memoized
+from utils.sharding import get_shard_runner
+from utils.streaming_indicators import MACD, get_indicator_streams
+
+# Google Apps Script signal labels, indexed by MACDScannerOriginal.signal_labels codes
+SIGNAL_LABELS = np.array(["STRONG BUY", "STRONG SELL", "WEAK BUY", "WEAK SELL", "BUY", "SELL", "NO SIGNAL"],
+                         dtype=object)
 
 class MACDScannerOriginal:
     """MACD Scanner with exact logic from user's original file"""
     
-    def __init__(self):
+    def __init__(self, provider=None):
         self.ist = pytz.timezone('Asia/Kolkata')
+        self.provider = provider
         
     def get_ist_time(self):
         """Get current IST time"""
@@ -17,17 +23,35 @@ class MACDScannerOriginal:
     
     @staticmethod
     def calculate_ema(data, period):
-        """Calculate Exponential Moving Average exactly like Google Apps Script"""
+        """
+        Calculate Exponential Moving Average exactly like Google Apps Script
+        
+        The EMA is seeded with the first value and every step computes
+        data[i] * k + ema[i - 1] * (1 - k) in float64, so every value is
+        bit-identical to the list-based version. The recurrence is
+        sequential, so it stays a loop, over Python floats with data[i] * k
+        precomputed for all bars at once.
+        
+        Args:
+            data: Sequence of prices
+            period: EMA period
+            
+        Returns:
+            NumPy array of EMA values
+        """
         k = 2 / (period + 1)
-        ema_array = [data[0]]
-
-        for i in range(1, len(data)):
-            ema_value = data[i] * k + ema_array[i - 1] * (1 - k)
-            ema_array.append(ema_value)
-
-        return ema_array
+        values = np.asarray(data, dtype=np.float64)
+        
+        ema = float(values[0])
+        ema_list = [ema]
+        for value in (values[1:] * k).tolist():
+            ema = value + ema * (1 - k)
+            ema_list.append(ema)
+        
+        return np.array(ema_list)
 
     @staticmethod
+    @memoized
     def calculate_macd(close_prices):
         """Calculate MACD exactly like the Google Apps Script reference"""
         if len(close_prices) < 30:
@@ -38,7 +62,7 @@ class MACDScannerOriginal:
         slow_ema = MACDScannerOriginal.calculate_ema(close_prices, 26)
 
         # MACD line
-        macd_line = [fast_ema[i] - slow_ema[i] for i in range(len(fast_ema))]
+        macd_line = fast_ema - slow_ema
 
         # Signal line (9-period EMA of MACD line)
         signal_line = MACDScannerOriginal.calculate_ema(macd_line, 9)
@@ -47,66 +71,95 @@ class MACDScannerOriginal:
         histogram = macd_line[-1] - signal_line[-1]
 
         # Generate signals using exact same logic as Google Apps Script
-        signals = []
-        for i in range(len(macd_line)):
-            macd_val = macd_line[i]
-            signal_val = signal_line[i]
-
-            if macd_val > signal_val and macd_val > 0 and signal_val > 0:
-                signals.append("STRONG BUY")
-            elif macd_val < signal_val and macd_val < 0 and signal_val < 0:
-                signals.append("STRONG SELL")
-            elif macd_val > signal_val and macd_val < 0:
-                signals.append("WEAK BUY")
-            elif macd_val < signal_val and macd_val > 0:
-                signals.append("WEAK SELL")
-            elif macd_val > signal_val:
-                signals.append("BUY")
-            elif macd_val < signal_val:
-                signals.append("SELL")
-            else:
-                signals.append("NO SIGNAL")
+        signals = MACDScannerOriginal.signal_labels(macd_line, signal_line)
 
         return {
-            'macd': macd_line[-1],
-            'signal': signal_line[-1],
-            'histogram': histogram,
-            'signals': signals
+            'macd': float(macd_line[-1]),
+            'signal': float(signal_line[-1]),
+            'histogram': float(histogram),
+            'signals': signals.tolist()
         }
     
+    @staticmethod
+    def signal_labels(macd_line, signal_line):
+        """
+        Get the Google Apps Script signal label of every bar
+        
+        Args:
+            macd_line: Array of MACD values
+            signal_line: Array of Signal values with the same shape
+            
+        Returns:
+            NumPy array of labels with the shape of the inputs
+        """
+        macd_line = np.asarray(macd_line, dtype=np.float64)
+        signal_line = np.asarray(signal_line, dtype=np.float64)
+        
+        above = macd_line > signal_line
+        below = macd_line < signal_line
+        
+        # Conditions of the if/elif chain assigned in reverse order, so the
+        # first matching one wins; NaN values match none ("NO SIGNAL")
+        codes = np.full(macd_line.shape, 6, dtype=np.int8)
+        codes[below] = 5
+        codes[above] = 4
+        codes[below & (macd_line > 0)] = 3
+        codes[above & (macd_line < 0)] = 2
+        codes[below & (macd_line < 0) & (signal_line < 0)] = 1
+        codes[above & (macd_line > 0) & (signal_line > 0)] = 0
+        
+        return SIGNAL_LABELS[codes]
+    
+    @staticmethod
+    def signal_label(macd_val, signal_val):
+        """Get the Google Apps Script signal label of one bar"""
+        if macd_val > signal_val and macd_val > 0 and signal_val > 0:
+            return "STRONG BUY"
+        elif macd_val < signal_val and macd_val < 0 and signal_val < 0:
+            return "STRONG SELL"
+        elif macd_val > signal_val and macd_val < 0:
+            return "WEAK BUY"
+        elif macd_val < signal_val and macd_val > 0:
+            return "WEAK SELL"
+        elif macd_val > signal_val:
+            return "BUY"
+        elif macd_val < signal_val:
+            return "SELL"
+        else:
+            return "NO SIGNAL"
+    
     def scan_crossovers(self, stock_symbols, timeframe='1d'):
         """Scan for MACD crossovers focusing on bearish to bullish transitions"""
+        from utils.data_fetcher import DataFetcher
+
         crossovers = []
 
-        for symbol in stock_symbols:
-            try:
-                stock = yf.Ticker(symbol)
-
-                # Get data based on timeframe
-                if timeframe == '4h':
-                    hist = stock.history(period="60d", interval="1h")
-                    # Resample to 4-hour intervals
-                    hist = hist.resample('4h').agg({
-                        'Open': 'first',
-                        'High': 'max',
-                        'Low': 'min',
-                        'Close': 'last',
-                        'Volume': 'sum'
-                    }).dropna()
-                else:
-                    hist = stock.history(period="3mo", interval="1d")
+        # Get data based on timeframe (4h is resampled from 60d of hourly bars),
+        # fetched for all symbols in batched requests
+        data_fetcher = DataFetcher(self.provider)
+        if timeframe == '4h':
+            stock_data = data_fetcher.get_multiple_stocks_data(stock_symbols, period="60d", interval="4h")
+        else:
+            stock_data = data_fetcher.get_multiple_stocks_data(stock_symbols, period="3mo", interval="1d")
+
+        streams = get_indicator_streams()
 
+        for symbol, hist in stock_data.items():
+            try:
                 if hist.empty or len(hist) < 30:
                     continue
 
-                prices = hist['Close'].tolist()
-                macd_data = self.calculate_macd(prices)
-
-                if not macd_data:
+                # Skip series whose last candles are frozen (see utils.data_quality)
+                if hist.attrs.get('quality', {}).get('frozen'):
                     continue
 
-                current_signal = macd_data['signals'][-1] if macd_data['signals'] else "NO SIGNAL"
-                prev_signal = macd_data['signals'][-2] if len(macd_data['signals']) > 1 else "NO SIGNAL"
+                # Incremental MACD state, identical to calculate_macd over the same bars
+                (prev_macd, prev_signal_line, _), (macd, signal, histogram) = streams.sync(
+                    symbol, timeframe, hist, 'macd_original', lambda: MACD(seeded=True)
+                )
+
+                current_signal = self.signal_label(macd, signal)
+                prev_signal = self.signal_label(prev_macd, prev_signal_line)
 
                 # Focus on bearish to bullish transitions
                 bearish_signals = ["SELL", "WEAK SELL", "STRONG SELL"]
@@ -122,16 +175,14 @@ class MACDScannerOriginal:
                         'previous_type': prev_signal,
                         'current_signal': current_signal,
                         'timestamp': self.get_ist_time(),
-                        'macd': macd_data['macd'],
-                        'signal': macd_data['signal'],
-                        'histogram': macd_data['histogram'],
-                        'price': prices[-1],
+                        'macd': macd,
+                        'signal': signal,
+                        'histogram': histogram,
+                        'price': float(hist['Close'].iloc[-1]),
                         'timeframe': timeframe,
                         'signal_strength': self._calculate_signal_strength(current_signal)
                     })
 
-                time.sleep(0.1)  # Rate limiting
-
             except Exception as e:
                 continue
 
@@ -163,7 +214,7 @@ class MACDScannerOriginal:
         """
         from utils.data_fetcher import DataFetcher
         
-        data_fetcher = DataFetcher()
+        data_fetcher = DataFetcher(self.provider)
         stock_symbols = data_fetcher.get_nse_stock_list()
         
         # Map timeframes for scanning
@@ -172,7 +223,10 @@ class MACDScannerOriginal:
         else:
             scan_timeframe = timeframe
             
-        crossovers = self.scan_crossovers(stock_symbols, scan_timeframe)
+        # Scan the universe in parallel shards
+        crossovers = get_shard_runner().run(
+            stock_symbols, lambda shard: self.scan_crossovers(shard, scan_timeframe)
+        )
         
         if not crossovers:
             return pd.DataFrame()
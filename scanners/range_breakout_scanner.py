@@ -1,73 +1,40 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from utils.data_fetcher import DataFetcher
+from utils.panel_indicators import BarPanel
+from utils.sharding import get_shard_runner
 from utils.technical_indicators import TechnicalIndicators
 
+# Pine Script ATR length; ranges are only detected on series at least this long
+ATR_LENGTH = 500
+
 class RangeBreakoutScanner:
     """Range Breakout Scanner using Pine Script logic with 4-hour intervals"""
     
-    def __init__(self):
-        self.data_fetcher = DataFetcher()
+    def __init__(self, provider=None):
+        self.data_fetcher = DataFetcher(provider)
         self.tech_indicators = TechnicalIndicators()
         
-    def scan(self, timeframe="4h", lookback_days=60):
+    def scan(self, timeframe="4h", lookback_days=400):
         """
         Scan for range breakout signals
         
         Args:
             timeframe: Data timeframe (4h recommended)
-            lookback_days: Number of days to look back
+            lookback_days: Number of days to look back (at two 4h bars per
+                session, 400 days cover the ATR_LENGTH bars detection needs)
             
         Returns:
             DataFrame with range breakout signals
         """
         try:
             symbols = self.data_fetcher.get_nse_stock_list()
-            results = []
-            
-            for symbol in symbols[:100]:  # Limit for performance
-                try:
-                    # Fetch data
-                    data = self.data_fetcher.get_stock_data(
-                        symbol, 
-                        period=f"{lookback_days}d",
-                        interval=timeframe
-                    )
-                    
-                    if data is None or len(data) < 100:
-                        continue
-                    
-                    # Detect ranges using Pine Script logic
-                    ranges = self.detect_ranges(data)
-                    
-                    if ranges:
-                        # Check for breakouts
-                        breakout = self.detect_breakout(data, ranges[-1])
-                        
-                        if breakout['type'] != 'none':
-                            current_price = data['Close'].iloc[-1]
-                            volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
-                            
-                            # Calculate range statistics
-                            range_data = ranges[-1]
-                            range_width = ((range_data['top'] - range_data['bottom']) / range_data['bottom']) * 100
-                            
-                            results.append({
-                                'Symbol': symbol,
-                                'Breakout_Type': breakout['type'],
-                                'Current_Price': round(current_price, 2),
-                                'Range_Top': round(range_data['top'], 2),
-                                'Range_Bottom': round(range_data['bottom'], 2),
-                                'Range_Width_%': round(range_width, 2),
-                                'Breakout_Strength': breakout['strength'],
-                                'Volume': int(volume),
-                                'Days_in_Range': range_data['duration'],
-                                'Timeframe': timeframe
-                            })
-                            
-                except Exception as e:
-                    print(f"Error processing {symbol}: {e}")
-                    continue
+            
+            # Scan the universe in parallel shards
+            results = get_shard_runner().run(
+                symbols, lambda shard: self._scan_shard(shard, timeframe, lookback_days)
+            )
             
             return pd.DataFrame(results)
             
@@ -75,7 +42,77 @@ class RangeBreakoutScanner:
             print(f"Error in Range Breakout scanner: {e}")
             return pd.DataFrame()
     
-    def detect_ranges(self, data, length=20, mult=1.0, atr_length=500):
+    def _scan_shard(self, symbols, timeframe, lookback_days):
+        """
+        Scan one shard of symbols for range breakout signals
+        
+        Args:
+            symbols: List of stock symbols
+            timeframe: Data timeframe
+            lookback_days: Number of days to look back
+            
+        Returns:
+            List of signal rows
+        """
+        results = []
+        
+        # Fetch the shard's symbols in batched requests
+        stock_data = self.data_fetcher.get_multiple_stocks_data(
+            symbols,
+            period=f"{lookback_days}d",
+            interval=timeframe
+        )
+        
+        # Detect ranges of every usable series in one panel pass
+        ranges_by_symbol = self.detect_ranges_panel({
+            symbol: data for symbol, data in stock_data.items()
+            if len(data) >= ATR_LENGTH and not data.attrs.get('quality', {}).get('frozen')
+        })
+        
+        for symbol, data in stock_data.items():
+            try:
+                if len(data) < ATR_LENGTH:
+                    continue
+                
+                # Skip series whose last candles are frozen (see utils.data_quality)
+                if data.attrs.get('quality', {}).get('frozen'):
+                    continue
+                
+                # Ranges detected using Pine Script logic
+                ranges = ranges_by_symbol.get(symbol, [])
+                
+                if ranges:
+                    # Check for breakouts
+                    breakout = self.detect_breakout(data, ranges[-1])
+                    
+                    if breakout['type'] != 'none':
+                        current_price = data['Close'].iloc[-1]
+                        volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
+                        
+                        # Calculate range statistics
+                        range_data = ranges[-1]
+                        range_width = ((range_data['top'] - range_data['bottom']) / range_data['bottom']) * 100
+                        
+                        results.append({
+                            'Symbol': symbol,
+                            'Breakout_Type': breakout['type'],
+                            'Current_Price': round(current_price, 2),
+                            'Range_Top': round(range_data['top'], 2),
+                            'Range_Bottom': round(range_data['bottom'], 2),
+                            'Range_Width_%': round(range_width, 2),
+                            'Breakout_Strength': breakout['strength'],
+                            'Volume': int(volume),
+                            'Days_in_Range': range_data['duration'],
+                            'Timeframe': timeframe
+                        })
+                        
+            except Exception as e:
+                print(f"Error processing {symbol}: {e}")
+                continue
+        
+        return results
+    
+    def detect_ranges(self, data, length=20, mult=1.0, atr_length=ATR_LENGTH):
         """
         Detect price ranges using Pine Script logic
         
@@ -95,54 +132,147 @@ class RangeBreakoutScanner:
             # Calculate ATR
             atr = self.tech_indicators.calculate_atr(data, period=min(atr_length, len(data)))
             
-            ranges = []
-            i = length
-            
-            while i < len(data) - 1:
-                # Calculate moving average for the range
-                ma = data['Close'].iloc[i-length:i].mean()
-                range_atr = atr.iloc[i] * mult
-                
-                # Check if price stayed within range
-                price_slice = data['Close'].iloc[i-length:i]
-                range_top = ma + range_atr
-                range_bottom = ma - range_atr
-                
-                # Count price movements outside the range
-                outside_count = 0
-                for price in price_slice:
-                    if abs(price - ma) > range_atr:
-                        outside_count += 1
-                
-                # If no price movements outside range, we have a valid range
-                if outside_count == 0:
-                    # Find the end of the range
-                    range_end = i
-                    while (range_end < len(data) - 1 and 
-                           range_bottom <= data['Close'].iloc[range_end] <= range_top):
-                        range_end += 1
-                    
-                    range_data = {
-                        'start': i - length,
-                        'end': range_end,
-                        'top': range_top,
-                        'bottom': range_bottom,
-                        'middle': ma,
-                        'duration': range_end - (i - length),
-                        'atr': range_atr
-                    }
-                    
-                    ranges.append(range_data)
-                    i = range_end + 1
-                else:
-                    i += 1
+            close = data['Close'].to_numpy(dtype=np.float64)
+            ma, range_atr, valid = self._range_windows(close[None, :], atr.to_numpy(dtype=np.float64)[None, :], length, mult)
             
-            return ranges
+            return self._collect_ranges(close, ma[0], range_atr[0], valid[0], length)
             
         except Exception as e:
             print(f"Error in range detection: {e}")
             return []
     
+    def detect_ranges_panel(self, stock_data, length=20, mult=1.0, atr_length=ATR_LENGTH):
+        """
+        Detect price ranges for many symbols at once
+        
+        The window statistics of every symbol are computed in one pass over
+        a BarPanel; only the ranges found are then extended per symbol.
+        Results are the same as detect_ranges for each symbol.
+        
+        Args:
+            stock_data: Dict with symbol as key and OHLCV DataFrame as value
+            length: Minimum range length
+            mult: Range width multiplier
+            atr_length: ATR calculation length
+            
+        Returns:
+            Dict with symbol as key and list of detected ranges as value
+        """
+        try:
+            stock_data = {symbol: data for symbol, data in stock_data.items()
+                          if data is not None and len(data) >= max(length, atr_length)}
+            if not stock_data:
+                return {}
+            
+            panel = BarPanel.from_frames(stock_data)
+            width = panel.close.shape[1]
+            
+            # ATR per symbol (memoized), right-aligned like the panel
+            atr = np.full(panel.close.shape, np.nan)
+            for row, symbol in enumerate(panel.symbols):
+                data = stock_data[symbol]
+                atr[row, width - len(data):] = self.tech_indicators.calculate_atr(
+                    data, period=min(atr_length, len(data))
+                ).to_numpy(dtype=np.float64)
+            
+            ma, range_atr, valid = self._range_windows(panel.close, atr, length, mult)
+            
+            ranges = {}
+            for row, symbol in enumerate(panel.symbols):
+                # Drop the windows that reach into the row's padding
+                offset = width - panel.lengths[row]
+                ranges[symbol] = self._collect_ranges(
+                    panel.close[row, offset:], ma[row, offset:], range_atr[row, offset:], valid[row, offset:], length
+                )
+            
+            return ranges
+            
+        except Exception as e:
+            print(f"Error in panel range detection: {e}")
+            return {symbol: self.detect_ranges(data, length, mult, atr_length) for symbol, data in stock_data.items()}
+    
+    @staticmethod
+    def _range_windows(close, atr, length, mult):
+        """
+        Get the range candidate statistics of every bar in one vectorized pass
+        
+        For each bar i from length to the second-to-last bar: the mean of the
+        previous length closes, the ATR band half-width at i and whether no
+        close of the window lies outside the band. A NaN ATR compares false,
+        so such windows count as valid, as in the bar-by-bar Pine Script port.
+        
+        Args:
+            close: 2-D array of closes (series x bars)
+            atr: 2-D array of ATR values with the same shape
+            length: Range length
+            mult: Range width multiplier
+            
+        Returns:
+            Tuple of 2-D arrays (ma, range_atr, valid) with one column per
+            bar i, starting at bar length
+        """
+        bars = close.shape[1]
+        if bars - 1 <= length:
+            empty = np.empty((close.shape[0], 0))
+            return empty, empty, empty.astype(bool)
+        
+        # windows[:, k] holds the closes of bars k to k + length - 1, the window of bar k + length
+        windows = sliding_window_view(close, length, axis=1)[:, :bars - 1 - length]
+        ma = np.mean(windows, axis=-1)
+        range_atr = atr[:, length:bars - 1] * mult
+        
+        with np.errstate(invalid='ignore'):
+            valid = ~(np.abs(windows - ma[:, :, None]) > range_atr[:, :, None]).any(axis=-1)
+        
+        return ma, range_atr, valid
+    
+    @staticmethod
+    def _collect_ranges(close, ma, range_atr, valid, length):
+        """
+        Walk the valid candidates of one series and extend each into a range
+        
+        After a range, the walk resumes past its end, so only the ranges
+        found are visited rather than every bar.
+        
+        Args:
+            close: 1-D array of closes
+            ma: Window means from _range_windows
+            range_atr: Band half-widths from _range_windows
+            valid: Valid-window mask from _range_windows
+            length: Range length
+            
+        Returns:
+            List of detected ranges
+        """
+        candidates = np.flatnonzero(valid) + length
+        ranges = []
+        i = length
+        
+        while True:
+            position = np.searchsorted(candidates, i)
+            if position == len(candidates):
+                break
+            
+            i = int(candidates[position])
+            middle = ma[i - length]
+            atr_band = range_atr[i - length]
+            range_top = middle + atr_band
+            range_bottom = middle - atr_band
+            range_end = _first_outside(close, i, range_bottom, range_top)
+            
+            ranges.append({
+                'start': i - length,
+                'end': range_end,
+                'top': range_top,
+                'bottom': range_bottom,
+                'middle': middle,
+                'duration': range_end - (i - length),
+                'atr': atr_band
+            })
+            i = range_end + 1
+        
+        return ranges
+    
     def detect_breakout(self, data, range_data):
         """
         Detect breakout from range
@@ -199,3 +329,27 @@ class RangeBreakoutScanner:
         except Exception as e:
             print(f"Error in breakout detection: {e}")
             return {'type': 'none', 'strength': 0}
+
+
+def _first_outside(close, start, bottom, top):
+    """
+    Find the first bar from start whose close leaves [bottom, top]
+
+    Searches in doubling chunks, so the cost is proportional to the range's
+    length. The last bar is never checked, as in the bar-by-bar loop.
+
+    Returns:
+        Bar position, or the last bar's position if the closes stay inside
+    """
+    stop = len(close) - 1
+    chunk = 32
+
+    while start < stop:
+        segment = close[start:min(start + chunk, stop)]
+        outside = ~((bottom <= segment) & (segment <= top))
+        if outside.any():
+            return start + int(np.argmax(outside))
+        start += len(segment)
+        chunk *= 2
+
+    return stop
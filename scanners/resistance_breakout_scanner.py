@@ -1,13 +1,14 @@
 import pandas as pd
-import numpy as np
 from utils.data_fetcher import DataFetcher
+from utils.price_levels import get_level_indexes
+from utils.sharding import get_shard_runner
 from utils.technical_indicators import TechnicalIndicators
 
 class ResistanceBreakoutScanner:
     """Resistance Breakout Scanner with 4-hour intervals for breakout + retracement detection"""
     
-    def __init__(self):
-        self.data_fetcher = DataFetcher()
+    def __init__(self, provider=None):
+        self.data_fetcher = DataFetcher(provider)
         self.tech_indicators = TechnicalIndicators()
         
     def scan(self, timeframe="4h", lookback_days=90):
@@ -23,51 +24,11 @@ class ResistanceBreakoutScanner:
         """
         try:
             symbols = self.data_fetcher.get_nse_stock_list()
-            results = []
             
-            for symbol in symbols[:100]:  # Limit for performance
-                try:
-                    # Fetch data
-                    data = self.data_fetcher.get_stock_data(
-                        symbol, 
-                        period=f"{lookback_days}d",
-                        interval=timeframe
-                    )
-                    
-                    if data is None or len(data) < 100:
-                        continue
-                    
-                    # Identify resistance levels
-                    resistance_levels = self.identify_resistance_levels(data)
-                    
-                    if resistance_levels:
-                        # Check for breakouts and retracements
-                        signal = self.detect_resistance_breakout(data, resistance_levels)
-                        
-                        if signal['type'] != 'none':
-                            current_price = data['Close'].iloc[-1]
-                            volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
-                            
-                            # Get the relevant resistance level
-                            resistance_level = signal['resistance_level']
-                            distance_to_resistance = ((current_price - resistance_level) / resistance_level) * 100
-                            
-                            results.append({
-                                'Symbol': symbol,
-                                'Signal_Type': signal['type'],
-                                'Current_Price': round(current_price, 2),
-                                'Resistance_Level': round(resistance_level, 2),
-                                'Distance_to_Resistance_%': round(distance_to_resistance, 2),
-                                'Breakout_Strength': signal['strength'],
-                                'Volume': int(volume),
-                                'Resistance_Touches': signal['touches'],
-                                'Days_Since_Breakout': signal.get('days_since_breakout', 0),
-                                'Timeframe': timeframe
-                            })
-                            
-                except Exception as e:
-                    print(f"Error processing {symbol}: {e}")
-                    continue
+            # Scan the universe in parallel shards
+            results = get_shard_runner().run(
+                symbols, lambda shard: self._scan_shard(shard, timeframe, lookback_days)
+            )
             
             return pd.DataFrame(results)
             
@@ -75,7 +36,71 @@ class ResistanceBreakoutScanner:
             print(f"Error in Resistance Breakout scanner: {e}")
             return pd.DataFrame()
     
-    def identify_resistance_levels(self, data, window=20, min_touches=3):
+    def _scan_shard(self, symbols, timeframe, lookback_days):
+        """
+        Scan one shard of symbols for resistance breakout signals
+        
+        Args:
+            symbols: List of stock symbols
+            timeframe: Data timeframe
+            lookback_days: Number of days to look back
+            
+        Returns:
+            List of signal rows
+        """
+        results = []
+        
+        # Fetch the shard's symbols in batched requests
+        stock_data = self.data_fetcher.get_multiple_stocks_data(
+            symbols,
+            period=f"{lookback_days}d",
+            interval=timeframe
+        )
+        
+        for symbol, data in stock_data.items():
+            try:
+                if len(data) < 100:
+                    continue
+                
+                # Skip series whose last candles are frozen (see utils.data_quality)
+                if data.attrs.get('quality', {}).get('frozen'):
+                    continue
+                
+                # Identify resistance levels
+                resistance_levels = self.identify_resistance_levels(data, symbol=symbol, interval=timeframe)
+                
+                if resistance_levels:
+                    # Check for breakouts and retracements
+                    signal = self.detect_resistance_breakout(data, resistance_levels)
+                    
+                    if signal['type'] != 'none':
+                        current_price = data['Close'].iloc[-1]
+                        volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
+                        
+                        # Get the relevant resistance level
+                        resistance_level = signal['resistance_level']
+                        distance_to_resistance = ((current_price - resistance_level) / resistance_level) * 100
+                        
+                        results.append({
+                            'Symbol': symbol,
+                            'Signal_Type': signal['type'],
+                            'Current_Price': round(current_price, 2),
+                            'Resistance_Level': round(resistance_level, 2),
+                            'Distance_to_Resistance_%': round(distance_to_resistance, 2),
+                            'Breakout_Strength': signal['strength'],
+                            'Volume': int(volume),
+                            'Resistance_Touches': signal['touches'],
+                            'Days_Since_Breakout': signal.get('days_since_breakout', 0),
+                            'Timeframe': timeframe
+                        })
+                        
+            except Exception as e:
+                print(f"Error processing {symbol}: {e}")
+                continue
+        
+        return results
+    
+    def identify_resistance_levels(self, data, window=20, min_touches=3, symbol=None, interval=None):
         """
         Identify resistance levels from price data
         
@@ -83,47 +108,17 @@ class ResistanceBreakoutScanner:
             data: OHLCV DataFrame
             window: Rolling window for peak detection
             min_touches: Minimum number of touches to confirm resistance
+            symbol: Stock symbol, to reuse its shared level index
+            interval: Data interval of the series
             
         Returns:
             List of resistance levels with metadata
         """
         try:
-            # Find local peaks (resistance candidates)
-            highs = data['High'].rolling(window=window, center=True).max()
-            peaks = data['High'] == highs
-            
-            resistance_levels = []
             tolerance = 0.02  # 2% tolerance for level matching
             
-            # Extract peak prices and indices
-            peak_prices = data.loc[peaks, 'High'].values
-            peak_indices = data.loc[peaks].index.values
-            
-            for i, peak_price in enumerate(peak_prices):
-                # Count touches within tolerance
-                touches = []
-                touch_indices = []
-                
-                for j, test_price in enumerate(data['High']):
-                    if abs(test_price - peak_price) / peak_price <= tolerance:
-                        touches.append(test_price)
-                        touch_indices.append(j)
-                
-                # Confirm as resistance if enough touches
-                if len(touches) >= min_touches:
-                    # Calculate average level
-                    avg_level = np.mean(touches)
-                    
-                    # Find most recent touch
-                    last_touch_idx = max(touch_indices)
-                    
-                    resistance_levels.append({
-                        'level': avg_level,
-                        'touches': len(touches),
-                        'last_touch': last_touch_idx,
-                        'first_touch': min(touch_indices),
-                        'strength': len(touches) * (1 + (len(data) - last_touch_idx) / len(data))
-                    })
+            # Peaks and their touches come from the series' shared level index
+            resistance_levels = get_level_indexes().get(symbol, interval, data, window).resistance(tolerance, min_touches)
             
             # Sort by strength (most recent and frequently tested levels first)
             resistance_levels.sort(key=lambda x: x['strength'], reverse=True)
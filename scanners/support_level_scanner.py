@@ -1,13 +1,14 @@
 import pandas as pd
-import numpy as np
 from utils.data_fetcher import DataFetcher
+from utils.price_levels import get_level_indexes
+from utils.sharding import get_shard_runner
 from utils.technical_indicators import TechnicalIndicators
 
 class SupportLevelScanner:
     """Support Level Scanner showing support & resistance levels on 4-hour intervals"""
     
-    def __init__(self):
-        self.data_fetcher = DataFetcher()
+    def __init__(self, provider=None):
+        self.data_fetcher = DataFetcher(provider)
         self.tech_indicators = TechnicalIndicators()
         
     def scan(self, timeframe="4h", lookback_days=90):
@@ -23,49 +24,11 @@ class SupportLevelScanner:
         """
         try:
             symbols = self.data_fetcher.get_nse_stock_list()
-            results = []
-            
-            for symbol in symbols[:100]:  # Limit for performance
-                try:
-                    # Fetch data
-                    data = self.data_fetcher.get_stock_data(
-                        symbol, 
-                        period=f"{lookback_days}d",
-                        interval=timeframe
-                    )
-                    
-                    if data is None or len(data) < 100:
-                        continue
-                    
-                    # Identify support and resistance levels
-                    support_levels = self.identify_support_levels(data)
-                    resistance_levels = self.identify_resistance_levels(data)
-                    
-                    # Analyze current position relative to levels
-                    analysis = self.analyze_current_position(data, support_levels, resistance_levels)
-                    
-                    if analysis['signal'] != 'none':
-                        current_price = data['Close'].iloc[-1]
-                        volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
-                        
-                        results.append({
-                            'Symbol': symbol,
-                            'Signal': analysis['signal'],
-                            'Current_Price': round(current_price, 2),
-                            'Nearest_Support': round(analysis['nearest_support'], 2) if analysis['nearest_support'] else None,
-                            'Nearest_Resistance': round(analysis['nearest_resistance'], 2) if analysis['nearest_resistance'] else None,
-                            'Distance_to_Support_%': round(analysis['distance_to_support'], 2) if analysis['distance_to_support'] else None,
-                            'Distance_to_Resistance_%': round(analysis['distance_to_resistance'], 2) if analysis['distance_to_resistance'] else None,
-                            'Support_Strength': analysis['support_strength'],
-                            'Resistance_Strength': analysis['resistance_strength'],
-                            'Risk_Reward_Ratio': analysis['risk_reward'],
-                            'Volume': int(volume),
-                            'Timeframe': timeframe
-                        })
-                        
-                except Exception as e:
-                    print(f"Error processing {symbol}: {e}")
-                    continue
+            
+            # Scan the universe in parallel shards
+            results = get_shard_runner().run(
+                symbols, lambda shard: self._scan_shard(shard, timeframe, lookback_days)
+            )
             
             return pd.DataFrame(results)
             
@@ -73,7 +36,69 @@ class SupportLevelScanner:
             print(f"Error in Support Level scanner: {e}")
             return pd.DataFrame()
     
-    def identify_support_levels(self, data, window=20, min_touches=2):
+    def _scan_shard(self, symbols, timeframe, lookback_days):
+        """
+        Scan one shard of symbols for support level signals
+        
+        Args:
+            symbols: List of stock symbols
+            timeframe: Data timeframe
+            lookback_days: Number of days to look back
+            
+        Returns:
+            List of signal rows
+        """
+        results = []
+        
+        # Fetch the shard's symbols in batched requests
+        stock_data = self.data_fetcher.get_multiple_stocks_data(
+            symbols,
+            period=f"{lookback_days}d",
+            interval=timeframe
+        )
+        
+        for symbol, data in stock_data.items():
+            try:
+                if len(data) < 100:
+                    continue
+                
+                # Skip series whose last candles are frozen (see utils.data_quality)
+                if data.attrs.get('quality', {}).get('frozen'):
+                    continue
+                
+                # Identify support and resistance levels
+                support_levels = self.identify_support_levels(data, symbol=symbol, interval=timeframe)
+                resistance_levels = self.identify_resistance_levels(data, symbol=symbol, interval=timeframe)
+                
+                # Analyze current position relative to levels
+                analysis = self.analyze_current_position(data, support_levels, resistance_levels)
+                
+                if analysis['signal'] != 'none':
+                    current_price = data['Close'].iloc[-1]
+                    volume = data['Volume'].iloc[-1] if 'Volume' in data else 0
+                    
+                    results.append({
+                        'Symbol': symbol,
+                        'Signal': analysis['signal'],
+                        'Current_Price': round(current_price, 2),
+                        'Nearest_Support': round(analysis['nearest_support'], 2) if analysis['nearest_support'] else None,
+                        'Nearest_Resistance': round(analysis['nearest_resistance'], 2) if analysis['nearest_resistance'] else None,
+                        'Distance_to_Support_%': round(analysis['distance_to_support'], 2) if analysis['distance_to_support'] else None,
+                        'Distance_to_Resistance_%': round(analysis['distance_to_resistance'], 2) if analysis['distance_to_resistance'] else None,
+                        'Support_Strength': analysis['support_strength'],
+                        'Resistance_Strength': analysis['resistance_strength'],
+                        'Risk_Reward_Ratio': analysis['risk_reward'],
+                        'Volume': int(volume),
+                        'Timeframe': timeframe
+                    })
+                    
+            except Exception as e:
+                print(f"Error processing {symbol}: {e}")
+                continue
+        
+        return results
+    
+    def identify_support_levels(self, data, window=20, min_touches=2, symbol=None, interval=None):
         """
         Identify support levels from price data
         
@@ -81,50 +106,17 @@ class SupportLevelScanner:
             data: OHLCV DataFrame
             window: Rolling window for trough detection
             min_touches: Minimum number of touches to confirm support
+            symbol: Stock symbol, to reuse its shared level index
+            interval: Data interval of the series
             
         Returns:
             List of support levels with metadata
         """
         try:
-            # Find local troughs (support candidates)
-            lows = data['Low'].rolling(window=window, center=True).min()
-            troughs = data['Low'] == lows
-            
-            support_levels = []
             tolerance = 0.025  # 2.5% tolerance for level matching
             
-            # Extract trough prices and indices
-            trough_prices = data.loc[troughs, 'Low'].values
-            trough_indices = data.loc[troughs].index.values
-            
-            for i, trough_price in enumerate(trough_prices):
-                # Count touches within tolerance
-                touches = []
-                touch_indices = []
-                
-                for j, test_price in enumerate(data['Low']):
-                    if abs(test_price - trough_price) / trough_price <= tolerance:
-                        touches.append(test_price)
-                        touch_indices.append(j)
-                
-                # Confirm as support if enough touches
-                if len(touches) >= min_touches:
-                    # Calculate average level
-                    avg_level = np.mean(touches)
-                    
-                    # Find most recent touch
-                    last_touch_idx = max(touch_indices)
-                    
-                    # Calculate strength based on touches and recency
-                    strength = len(touches) * (1 + (len(data) - last_touch_idx) / len(data))
-                    
-                    support_levels.append({
-                        'level': avg_level,
-                        'touches': len(touches),
-                        'last_touch': last_touch_idx,
-                        'first_touch': min(touch_indices),
-                        'strength': strength
-                    })
+            # Troughs and their touches come from the series' shared level index
+            support_levels = get_level_indexes().get(symbol, interval, data, window).support(tolerance, min_touches)
             
             # Sort by strength
             support_levels.sort(key=lambda x: x['strength'], reverse=True)
@@ -135,7 +127,7 @@ class SupportLevelScanner:
             print(f"Error in support level identification: {e}")
             return []
     
-    def identify_resistance_levels(self, data, window=20, min_touches=2):
+    def identify_resistance_levels(self, data, window=20, min_touches=2, symbol=None, interval=None):
         """
         Identify resistance levels from price data
         
@@ -143,50 +135,17 @@ class SupportLevelScanner:
             data: OHLCV DataFrame
             window: Rolling window for peak detection
             min_touches: Minimum number of touches to confirm resistance
+            symbol: Stock symbol, to reuse its shared level index
+            interval: Data interval of the series
             
         Returns:
             List of resistance levels with metadata
         """
         try:
-            # Find local peaks (resistance candidates)
-            highs = data['High'].rolling(window=window, center=True).max()
-            peaks = data['High'] == highs
-            
-            resistance_levels = []
             tolerance = 0.025  # 2.5% tolerance for level matching
             
-            # Extract peak prices and indices
-            peak_prices = data.loc[peaks, 'High'].values
-            peak_indices = data.loc[peaks].index.values
-            
-            for i, peak_price in enumerate(peak_prices):
-                # Count touches within tolerance
-                touches = []
-                touch_indices = []
-                
-                for j, test_price in enumerate(data['High']):
-                    if abs(test_price - peak_price) / peak_price <= tolerance:
-                        touches.append(test_price)
-                        touch_indices.append(j)
-                
-                # Confirm as resistance if enough touches
-                if len(touches) >= min_touches:
-                    # Calculate average level
-                    avg_level = np.mean(touches)
-                    
-                    # Find most recent touch
-                    last_touch_idx = max(touch_indices)
-                    
-                    # Calculate strength
-                    strength = len(touches) * (1 + (len(data) - last_touch_idx) / len(data))
-                    
-                    resistance_levels.append({
-                        'level': avg_level,
-                        'touches': len(touches),
-                        'last_touch': last_touch_idx,
-                        'first_touch': min(touch_indices),
-                        'strength': strength
-                    })
+            # Peaks and their touches come from the series' shared level index
+            resistance_levels = get_level_indexes().get(symbol, interval, data, window).resistance(tolerance, min_touches)
             
             # Sort by strength
             resistance_levels.sort(key=lambda x: x['strength'], reverse=True)
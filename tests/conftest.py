@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+# Keep the process-wide caches out of the working tree; set before any utils import
+_cache_root = tempfile.mkdtemp(prefix='nse-screener-tests-')
+os.environ.setdefault('NSE_SCREENER_PROVIDER', 'replay')
+os.environ.setdefault('NSE_SCREENER_REPLAY_DIR', os.path.join(_cache_root, 'replay'))
+os.environ.setdefault('NSE_SCREENER_CACHE_DIR', os.path.join(_cache_root, 'bars'))
+os.environ.setdefault('NSE_SCREENER_MMAP_DIR', os.path.join(_cache_root, 'mmap'))
+os.environ.setdefault('NSE_SCREENER_RETRY_DELAY', '0')
+
+import pandas as pd
+import pytest
+
+# Replay clock of the fetcher fixture: a Wednesday, mid-session
+REPLAY_NOW = pd.Timestamp('2026-10-14 11:20', tz='Asia/Kolkata')
+
+
+@pytest.fixture
+def replay_provider(tmp_path):
+    """Replay provider with synthetic bars up to REPLAY_NOW"""
+    from utils.providers import ReplayProvider
+
+    return ReplayProvider(str(tmp_path / 'replay'), now=REPLAY_NOW, synthetic=True)
+
+
+@pytest.fixture
+def fetcher(replay_provider):
+    """DataFetcher on the replay provider, with every process-wide cache emptied"""
+    from utils.bar_store import get_bar_store
+    from utils.data_fetcher import DataFetcher
+    from utils.quote_cache import get_quote_cache
+    from utils.resilience import get_resilient_caller
+    from utils.rollup import get_bar_rollup
+
+    bar_store = get_bar_store()
+    disk_cache = bar_store.disk_cache
+    bar_store.disk_cache = None
+
+    bar_store.clear()
+    get_bar_rollup().clear()
+    get_quote_cache().clear()
+    get_resilient_caller()._breakers.clear()
+
+    yield DataFetcher(provider=replay_provider)
+
+    bar_store.disk_cache = disk_cache
+    get_resilient_caller()._breakers.clear()
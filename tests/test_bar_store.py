@@ -0,0 +1,20 @@
+import numpy as np
+from conftest import REPLAY_NOW
+from utils.bar_arrays import bar_arrays_path
+from utils.bar_store import BarStore
+from utils.providers import synthetic_bars
+
+
+def test_bar_arrays_are_published_on_first_use(tmp_path):
+    store = BarStore(mmap_dir=str(tmp_path))
+    data = synthetic_bars('RELIANCE.NS', '1h', REPLAY_NOW, days=30)
+
+    store.put('RELIANCE.NS', '1h', '30d', data)
+    assert not (tmp_path / 'RELIANCE.NS__1h__30d.npy').exists()
+
+    arrays = store.get_arrays('RELIANCE.NS', '1h', '30d')
+
+    assert bar_arrays_path(str(tmp_path), 'RELIANCE.NS', '1h', '30d') == str(tmp_path / 'RELIANCE.NS__1h__30d.npy')
+    assert store.get_arrays('RELIANCE.NS', '1h', '30d') is arrays
+    np.testing.assert_array_equal(arrays.close, data['Close'].to_numpy())
+    np.testing.assert_array_equal(arrays.to_frame().index.as_unit('ns').asi8, data.index.as_unit('ns').asi8)
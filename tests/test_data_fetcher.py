@@ -0,0 +1,43 @@
+SYMBOLS = ['RELIANCE.NS', 'TCS.NS', 'INFY.NS']
+
+
+def test_quote_snapshot_from_replay(fetcher, replay_provider):
+    quotes = fetcher.get_quote_snapshot(SYMBOLS)
+
+    assert quotes.index.tolist() == SYMBOLS
+    for symbol in SYMBOLS:
+        closes = replay_provider.history(symbol, '1d', '5d')['Close']
+        assert quotes.loc[symbol, 'price'] == closes.iloc[-1]
+        assert quotes.loc[symbol, 'previous_close'] == closes.iloc[-2]
+
+
+def test_latest_price_from_replay(fetcher, replay_provider):
+    latest = fetcher.get_latest_price('TCS.NS')
+
+    assert latest is not None
+    assert latest['current_price'] == replay_provider.history('TCS.NS', '1d', '5d')['Close'].iloc[-1]
+
+
+def test_delisted_symbols_do_not_open_the_circuit(fetcher, replay_provider):
+    from utils.resilience import get_resilient_caller
+
+    delisted = {'GONE1.NS', 'GONE2.NS', 'GONE3.NS'}
+    calls = []
+    history, download = replay_provider.history, replay_provider.download
+
+    def empty_history(symbol, *args, **kwargs):
+        calls.append(symbol)
+        return history(symbol, *args, **kwargs).iloc[:0] if symbol in delisted else history(symbol, *args, **kwargs)
+
+    def partial_download(symbols, *args, **kwargs):
+        return {symbol: data for symbol, data in download(symbols, *args, **kwargs).items() if symbol not in delisted}
+
+    replay_provider.history = empty_history
+    replay_provider.download = partial_download
+
+    stock_data = fetcher.get_multiple_stocks_data(SYMBOLS + sorted(delisted), period='60d', interval='1h')
+
+    assert list(stock_data) == SYMBOLS
+    assert sorted(calls) == sorted(delisted)
+    assert get_resilient_caller().states()[replay_provider.host] == 'closed'
+    assert fetcher.get_stock_data('RELIANCE.NS', '30d', '1h') is not None
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from scanners.macd_scanner_original import MACDScannerOriginal
+
+
+def reference_ema(data, period):
+    """List-based EMA of the Google Apps Script reference"""
+    k = 2 / (period + 1)
+    ema_array = [data[0]]
+
+    for i in range(1, len(data)):
+        ema_value = data[i] * k + ema_array[i - 1] * (1 - k)
+        ema_array.append(ema_value)
+
+    return ema_array
+
+
+def reference_macd(close_prices):
+    """List-based MACD and signal labels of the Google Apps Script reference"""
+    if len(close_prices) < 30:
+        return None
+
+    fast_ema = reference_ema(close_prices, 12)
+    slow_ema = reference_ema(close_prices, 26)
+    macd_line = [fast_ema[i] - slow_ema[i] for i in range(len(fast_ema))]
+    signal_line = reference_ema(macd_line, 9)
+
+    signals = []
+    for macd_val, signal_val in zip(macd_line, signal_line):
+        if macd_val > signal_val and macd_val > 0 and signal_val > 0:
+            signals.append("STRONG BUY")
+        elif macd_val < signal_val and macd_val < 0 and signal_val < 0:
+            signals.append("STRONG SELL")
+        elif macd_val > signal_val and macd_val < 0:
+            signals.append("WEAK BUY")
+        elif macd_val < signal_val and macd_val > 0:
+            signals.append("WEAK SELL")
+        elif macd_val > signal_val:
+            signals.append("BUY")
+        elif macd_val < signal_val:
+            signals.append("SELL")
+        else:
+            signals.append("NO SIGNAL")
+
+    return {
+        'macd': macd_line[-1],
+        'signal': signal_line[-1],
+        'histogram': macd_line[-1] - signal_line[-1],
+        'signals': signals
+    }
+
+
+def price_series(seed):
+    """Random walk with flat runs (equal MACD and signal) and the odd gap"""
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(30, 400))
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+    flat_start = int(rng.integers(0, n))
+    prices[flat_start:flat_start + int(rng.integers(0, 60))] = prices[flat_start]
+
+    if seed % 5 == 0:
+        prices[int(rng.integers(0, n))] = np.nan
+
+    return prices.tolist()
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_ema_matches_reference(seed):
+    prices = price_series(seed)
+
+    for period in (9, 12, 26):
+        np.testing.assert_array_equal(
+            MACDScannerOriginal.calculate_ema(prices, period), np.array(reference_ema(prices, period))
+        )
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_macd_matches_reference(seed):
+    prices = price_series(seed)
+    expected = reference_macd(prices)
+    result = MACDScannerOriginal.calculate_macd(prices)
+
+    np.testing.assert_array_equal(
+        [result['macd'], result['signal'], result['histogram']],
+        [expected['macd'], expected['signal'], expected['histogram']]
+    )
+    assert result['signals'] == expected['signals']
+
+
+def test_constant_series_has_no_signal():
+    result = MACDScannerOriginal.calculate_macd([250.0] * 40)
+
+    assert result['macd'] == 0.0
+    assert set(result['signals']) == {"NO SIGNAL"}
+
+
+def test_short_series_is_rejected():
+    assert MACDScannerOriginal.calculate_macd([100.0] * 29) is None
+
+
+def test_signal_labels_match_scalar_labels():
+    rng = np.random.default_rng(0)
+    macd_line = rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0, np.nan], 500)
+    signal_line = rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0, np.nan], 500)
+
+    labels = MACDScannerOriginal.signal_labels(macd_line, signal_line)
+
+    assert labels.tolist() == [
+        MACDScannerOriginal.signal_label(macd_val, signal_val)
+        for macd_val, signal_val in zip(macd_line.tolist(), signal_line.tolist())
+    ]
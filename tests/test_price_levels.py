@@ -0,0 +1,112 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from scanners.resistance_breakout_scanner import ResistanceBreakoutScanner
+from scanners.support_level_scanner import SupportLevelScanner
+from utils.price_levels import LevelIndex
+from utils.technical_indicators import TechnicalIndicators
+
+
+def bars(seed, n=None):
+    """Random-walk bars on a 0.05 tick, so many bars share a price"""
+    rng = np.random.default_rng(seed)
+    n = n or int(rng.integers(60, 500))
+    close = np.round((100 + np.cumsum(rng.normal(0, 0.8, n))) / 0.05) * 0.05
+    spread = np.round(np.abs(rng.normal(0, 0.6, n)) / 0.05) * 0.05
+
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000, 100_000, n).astype(np.float64)
+    }, index=pd.date_range('2026-01-01', periods=n, freq='4h', tz='Asia/Kolkata'))
+
+
+def reference_levels(data, column, window, tolerance, min_touches):
+    """Bar-by-bar level search of the scanners before the shared level index"""
+    rolling = data[column].rolling(window=window, center=True)
+    extremes = rolling.max() if column == 'High' else rolling.min()
+    candidates = data.loc[data[column] == extremes, column].values
+
+    levels = []
+    for candidate in candidates:
+        touches = []
+        touch_indices = []
+
+        for j, test_price in enumerate(data[column]):
+            if abs(test_price - candidate) / candidate <= tolerance:
+                touches.append(test_price)
+                touch_indices.append(j)
+
+        if len(touches) >= min_touches:
+            last_touch_idx = max(touch_indices)
+            levels.append({
+                'level': np.mean(touches),
+                'touches': len(touches),
+                'last_touch': last_touch_idx,
+                'first_touch': min(touch_indices),
+                'strength': len(touches) * (1 + (len(data) - last_touch_idx) / len(data))
+            })
+
+    levels.sort(key=lambda x: x['strength'], reverse=True)
+    return levels[:10]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_support_scanner_matches_reference(seed):
+    data = bars(seed)
+    scanner = SupportLevelScanner()
+
+    assert scanner.identify_support_levels(data) == reference_levels(data, 'Low', 20, 0.025, 2)
+    assert scanner.identify_resistance_levels(data) == reference_levels(data, 'High', 20, 0.025, 2)
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_resistance_breakout_scanner_matches_reference(seed):
+    data = bars(seed)
+
+    assert ResistanceBreakoutScanner().identify_resistance_levels(data) == reference_levels(data, 'High', 20, 0.02, 3)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_shared_index_answers_every_tolerance(seed):
+    data = bars(seed)
+    index = LevelIndex(data)
+
+    for tolerance, min_touches in [(0.02, 3), (0.025, 2), (0.02, 1), (0.025, 2)]:
+        expected = reference_levels(data, 'High', 20, tolerance, min_touches)
+        levels = sorted(index.resistance(tolerance, min_touches), key=lambda x: x['strength'], reverse=True)
+        assert levels[:10] == expected
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_detect_support_resistance_matches_pandas(seed):
+    data = bars(seed)
+    levels = TechnicalIndicators.detect_support_resistance(data)
+
+    highs = data['High'].rolling(window=20, center=True).max()
+    lows = data['Low'].rolling(window=20, center=True).min()
+    np.testing.assert_array_equal(levels['resistance'], data.loc[data['High'] == highs, 'High'].values)
+    np.testing.assert_array_equal(levels['support'], data.loc[data['Low'] == lows, 'Low'].values)
+
+
+@pytest.mark.skipif(os.environ.get('NSE_SCREENER_BENCHMARK') != '1', reason='set NSE_SCREENER_BENCHMARK=1 to run')
+def test_benchmark_level_search():
+    data = bars(0, n=2000)
+    scanner = SupportLevelScanner()
+
+    start = time.perf_counter()
+    expected = reference_levels(data, 'Low', 20, 0.025, 2)
+    reference_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    levels = scanner.identify_support_levels(data)
+    indexed_seconds = time.perf_counter() - start
+
+    print(f"\nsupport levels on {len(data)} bars: reference {reference_seconds * 1000:.1f} ms, "
+          f"level index {indexed_seconds * 1000:.1f} ms ({reference_seconds / indexed_seconds:.0f}x)")
+    assert levels == expected
+    assert indexed_seconds < reference_seconds
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scanners.range_breakout_scanner import ATR_LENGTH, RangeBreakoutScanner
+
+
+def bars(seed, n):
+    """Random walk alternating between trending and sideways stretches"""
+    rng = np.random.default_rng(seed)
+    volatility = np.repeat(rng.choice([0.002, 0.015], -(-n // 40)), 40)[:n]
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1, n) * volatility))
+    spread = close * np.abs(rng.normal(0, 0.01, n))
+
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000, 100_000, n).astype(np.float64)
+    }, index=pd.date_range('2025-01-01', periods=n, freq='4h', tz='Asia/Kolkata'))
+
+
+def reference_ranges(scanner, data, length=20, mult=1.0, atr_length=ATR_LENGTH):
+    """Bar-by-bar Pine Script port the scanner used before the vectorized windows"""
+    if len(data) < max(length, atr_length):
+        return []
+
+    atr = scanner.tech_indicators.calculate_atr(data, period=min(atr_length, len(data)))
+    ranges = []
+    i = length
+
+    while i < len(data) - 1:
+        ma = data['Close'].iloc[i - length:i].mean()
+        range_atr = atr.iloc[i] * mult
+        price_slice = data['Close'].iloc[i - length:i]
+        range_top = ma + range_atr
+        range_bottom = ma - range_atr
+
+        outside_count = 0
+        for price in price_slice:
+            if abs(price - ma) > range_atr:
+                outside_count += 1
+
+        if outside_count == 0:
+            range_end = i
+            while (range_end < len(data) - 1 and
+                   range_bottom <= data['Close'].iloc[range_end] <= range_top):
+                range_end += 1
+
+            ranges.append({
+                'start': i - length,
+                'end': range_end,
+                'top': range_top,
+                'bottom': range_bottom,
+                'middle': ma,
+                'duration': range_end - (i - length),
+                'atr': range_atr
+            })
+            i = range_end + 1
+        else:
+            i += 1
+
+    return ranges
+
+
+def assert_same_ranges(ranges, expected, rtol=1e-12):
+    # Ranges found while the ATR warms up have NaN bands, so compare NaN as equal
+    assert [(r['start'], r['end'], r['duration']) for r in ranges] == \
+        [(r['start'], r['end'], r['duration']) for r in expected]
+    for key in ('top', 'bottom', 'middle', 'atr'):
+        np.testing.assert_allclose([r[key] for r in ranges], [r[key] for r in expected], rtol=rtol)
+
+
+@pytest.mark.parametrize('mult', [0.5, 1.0, 2.0])
+@pytest.mark.parametrize('seed', range(10))
+def test_detect_ranges_matches_reference(seed, mult):
+    scanner = RangeBreakoutScanner()
+    data = bars(seed, 300)
+
+    ranges = scanner.detect_ranges(data, mult=mult, atr_length=50)
+
+    assert_same_ranges(ranges, reference_ranges(scanner, data, mult=mult, atr_length=50))
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_detect_ranges_matches_reference_at_default_atr_length(seed):
+    scanner = RangeBreakoutScanner()
+    data = bars(seed, ATR_LENGTH + 80)
+
+    assert_same_ranges(scanner.detect_ranges(data), reference_ranges(scanner, data))
+
+
+def test_short_series_have_no_ranges():
+    scanner = RangeBreakoutScanner()
+
+    assert scanner.detect_ranges(bars(0, ATR_LENGTH - 1)) == []
+    assert scanner.detect_ranges_panel({'SHORT.NS': bars(0, ATR_LENGTH - 1)}) == {}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_panel_matches_single_series(seed):
+    scanner = RangeBreakoutScanner()
+    rng = np.random.default_rng(seed)
+    # Unequal lengths exercise the panel's left padding; one is too short to scan
+    stock_data = {f"S{k}.NS": bars(seed * 10 + k, int(rng.integers(40, 400))) for k in range(8)}
+    stock_data['SHORT.NS'] = bars(seed, 30)
+
+    panel = scanner.detect_ranges_panel(stock_data, atr_length=50)
+
+    assert set(panel) == {symbol for symbol, data in stock_data.items() if len(data) >= 50}
+    for symbol, ranges in panel.items():
+        assert_same_ranges(ranges, scanner.detect_ranges(stock_data[symbol], atr_length=50), rtol=0)
@@ -0,0 +1,35 @@
+import os
+from conftest import REPLAY_NOW
+import utils.disk_cache as disk_cache
+from utils.disk_cache import DiskBarCache
+from utils.providers import ReplayProvider, synthetic_bars
+
+
+def test_replay_reads_recorded_series(tmp_path):
+    data = synthetic_bars('RELIANCE.NS', '1d', REPLAY_NOW, days=60)
+    DiskBarCache(str(tmp_path)).save('RELIANCE.NS', '1d', data, data.index[0])
+
+    replayed = ReplayProvider(str(tmp_path), now=REPLAY_NOW).history('RELIANCE.NS', '1d', '30d')
+
+    assert not replayed.empty
+    assert replayed['Close'].iloc[-1] == data['Close'].iloc[-1]
+
+
+def test_replay_never_deletes_recorded_files(tmp_path, monkeypatch):
+    unreadable = tmp_path / 'TCS.NS__1d.npz'
+    unreadable.write_bytes(b'not an npz file')
+    stale_schema = tmp_path / 'INFY.NS__1d.npz'
+    data = synthetic_bars('INFY.NS', '1d', REPLAY_NOW, days=60)
+    DiskBarCache(str(tmp_path)).save('INFY.NS', '1d', data, data.index[0])
+    with open(stale_schema, 'rb') as f:
+        recorded = f.read()
+    os.utime(stale_schema, (0, 0))
+
+    monkeypatch.setattr(disk_cache, 'SCHEMA_VERSION', disk_cache.SCHEMA_VERSION + 1)
+    provider = ReplayProvider(str(tmp_path), now=REPLAY_NOW, synthetic=True)
+    provider.history('TCS.NS', '1d', '30d')
+    provider.history('INFY.NS', '1d', '30d')
+
+    assert unreadable.read_bytes() == b'not an npz file'
+    assert stale_schema.read_bytes() == recorded
+    assert os.stat(stale_schema).st_mtime == 0
@@ -0,0 +1,39 @@
+import pytest
+from utils.resilience import CircuitOpenError, NoDataError, ResilientCaller
+
+
+class Failing:
+    """Callable raising the same error on every call"""
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        raise self.error
+
+
+def test_empty_answers_are_not_retried_or_counted():
+    caller = ResilientCaller(max_attempts=3, base_delay=0, failure_threshold=2)
+    empty = Failing(NoDataError('no bars'))
+
+    for _ in range(5):
+        with pytest.raises(NoDataError):
+            caller.call('host', empty)
+
+    assert empty.calls == 5
+    assert caller.states() == {'host': 'closed'}
+
+
+def test_transport_errors_are_retried_and_open_the_circuit():
+    caller = ResilientCaller(max_attempts=3, base_delay=0, failure_threshold=3)
+    down = Failing(ConnectionError('reset'))
+
+    with pytest.raises(ConnectionError):
+        caller.call('host', down)
+
+    assert down.calls == 3
+    assert caller.states() == {'host': 'open'}
+    with pytest.raises(CircuitOpenError):
+        caller.call('host', down)
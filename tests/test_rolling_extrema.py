@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.rolling_extrema import rolling_max, rolling_min
+
+
+def series(seed, n):
+    """Prices rounded to the tick so windows hold ties, with a few NaN gaps"""
+    rng = np.random.default_rng(seed)
+    values = np.round(100 + np.cumsum(rng.normal(0, 1, n)), 0)
+    if seed % 3 == 0:
+        values[rng.integers(0, n, 3)] = np.nan
+    return values
+
+
+def reference_positions(values, window, center, argbest):
+    """First bar of each window's extremum, by brute force"""
+    n = len(values)
+    offset = (window - 1) // 2 if center else 0
+    positions = np.full(n, -1)
+
+    for end in range(window - 1, n):
+        start = end - window + 1
+        block = values[start:end + 1]
+        if not np.isnan(block).any():
+            positions[end - offset] = start + int(argbest(block))
+
+    return positions
+
+
+@pytest.mark.parametrize('center', [False, True])
+@pytest.mark.parametrize('window', [1, 2, 5, 14, 20, 99])
+@pytest.mark.parametrize('seed', range(12))
+def test_matches_pandas(seed, window, center):
+    values = series(seed, int(np.random.default_rng(seed).integers(1, 150)))
+    rolling = pd.Series(values).rolling(window, center=center)
+
+    np.testing.assert_array_equal(rolling_max(values, window, center=center), rolling.max().to_numpy())
+    np.testing.assert_array_equal(rolling_min(values, window, center=center), rolling.min().to_numpy())
+
+
+@pytest.mark.parametrize('center', [False, True])
+@pytest.mark.parametrize('window', [1, 3, 10, 21])
+@pytest.mark.parametrize('seed', range(12))
+def test_positions_are_the_first_extremum(seed, window, center):
+    values = series(seed, 120)
+
+    maxima, max_positions = rolling_max(values, window, center=center, return_positions=True)
+    minima, min_positions = rolling_min(values, window, center=center, return_positions=True)
+
+    np.testing.assert_array_equal(max_positions, reference_positions(values, window, center, np.argmax))
+    np.testing.assert_array_equal(min_positions, reference_positions(values, window, center, np.argmin))
+    found = max_positions >= 0
+    np.testing.assert_array_equal(values[max_positions[found]], maxima[found])
+
+
+def test_rows_are_independent_series():
+    panel = np.vstack([series(seed, 80) for seed in range(6)])
+
+    maxima, positions = rolling_max(panel, 14, return_positions=True)
+
+    for row, values in enumerate(panel):
+        expected, expected_positions = rolling_max(values, 14, return_positions=True)
+        np.testing.assert_array_equal(maxima[row], expected)
+        np.testing.assert_array_equal(positions[row], expected_positions)
+
+
+def test_window_longer_than_series_is_all_nan():
+    values = series(1, 10)
+
+    assert np.isnan(rolling_min(values, 11)).all()
+    assert (rolling_min(values, 11, return_positions=True)[1] == -1).all()
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scanners.macd_scanner_original import MACDScannerOriginal
+from utils.streaming_indicators import ATR, MACD, RSI, IndicatorStreams
+from utils.technical_indicators import TechnicalIndicators
+
+
+def ohlc_bars(seed, n=None):
+    """Random-walk bars with flat runs and, for some seeds, a missing close"""
+    rng = np.random.default_rng(seed)
+    n = n or int(rng.integers(40, 300))
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+    flat_start = int(rng.integers(0, n))
+    close[flat_start:flat_start + int(rng.integers(0, 30))] = close[flat_start]
+
+    spread = np.abs(rng.normal(0, 0.5, n))
+    data = pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000, 100_000, n).astype(np.float64)
+    }, index=pd.date_range('2026-01-01 09:15', periods=n, freq='h', tz='Asia/Kolkata'))
+
+    if seed % 4 == 0:
+        data.iloc[int(rng.integers(1, n)), data.columns.get_loc('Close')] = np.nan
+
+    return data
+
+
+def batch_macd(data):
+    return TechnicalIndicators.calculate_macd(data['Close'])[['MACD', 'Signal', 'Histogram']].to_numpy()
+
+
+def batch_seeded_macd(data):
+    # Same arithmetic as MACDScannerOriginal.calculate_macd, all bars rather than the last
+    close = data['Close'].tolist()
+    fast = MACDScannerOriginal.calculate_ema(close, 12)
+    slow = MACDScannerOriginal.calculate_ema(close, 26)
+    macd_line = fast - slow
+    signal_line = MACDScannerOriginal.calculate_ema(macd_line.tolist(), 9)
+    return np.column_stack([macd_line, signal_line, macd_line - signal_line])
+
+
+def batch_atr(data):
+    return TechnicalIndicators.calculate_atr(data).to_numpy()
+
+
+def batch_rsi(data):
+    return TechnicalIndicators.calculate_rsi(data['Close']).to_numpy()
+
+
+INDICATORS = {
+    'macd': (MACD, ('Close',), batch_macd),
+    'seeded_macd': (lambda: MACD(seeded=True), ('Close',), batch_seeded_macd),
+    'atr': (ATR, ('High', 'Low', 'Close'), batch_atr),
+    'rsi': (RSI, ('Close',), batch_rsi)
+}
+
+
+def rows(data, columns):
+    return list(zip(*(data[column].to_numpy(dtype=np.float64).tolist() for column in columns)))
+
+
+@pytest.mark.parametrize('name', INDICATORS)
+@pytest.mark.parametrize('seed', range(40))
+def test_update_matches_batch(name, seed):
+    factory, columns, batch = INDICATORS[name]
+    data = ohlc_bars(seed)
+    indicator = factory()
+
+    streamed = [indicator.update(*row) for row in rows(data, columns)]
+
+    np.testing.assert_array_equal(np.array(streamed, dtype=np.float64).reshape(batch(data).shape), batch(data))
+
+
+@pytest.mark.parametrize('name', INDICATORS)
+@pytest.mark.parametrize('seed', range(40))
+def test_revising_the_forming_bar_matches_batch(name, seed):
+    factory, columns, batch = INDICATORS[name]
+    data = ohlc_bars(seed)
+    indicator = factory()
+    streamed = []
+
+    # Every bar first arrives as a forming bar with other prices, then is revised twice
+    for row, forming in zip(rows(data, columns), rows(data * 1.01, columns)):
+        indicator.update(*forming)
+        indicator.revise(*(value * 0.98 for value in forming))
+        streamed.append(indicator.revise(*row))
+
+    np.testing.assert_array_equal(np.array(streamed, dtype=np.float64).reshape(batch(data).shape), batch(data))
+
+
+@pytest.mark.parametrize('name', INDICATORS)
+@pytest.mark.parametrize('seed', range(20))
+def test_streams_follow_the_series(name, seed):
+    factory, columns, batch = INDICATORS[name]
+    data = ohlc_bars(seed, n=200)
+    streams = IndicatorStreams()
+
+    def sync(series):
+        return np.array(streams.sync('TEST.NS', '1h', series, name, factory, columns), dtype=np.float64)
+
+    # Forming last bar, then the same bar closed with more bars after it
+    forming = data.iloc[:120].copy()
+    forming.iloc[-1, :4] *= 1.02
+    np.testing.assert_array_equal(sync(forming).reshape(-1), batch(forming)[-2:].reshape(-1))
+    np.testing.assert_array_equal(sync(data.iloc[:150]).reshape(-1), batch(data.iloc[:150])[-2:].reshape(-1))
+
+    # The period window rolled: the first bar moved, so the state is rebuilt
+    rolled = data.iloc[10:]
+    np.testing.assert_array_equal(sync(rolled).reshape(-1), batch(rolled)[-2:].reshape(-1))
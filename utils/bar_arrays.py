@@ -0,0 +1,109 @@
+import os
+import tempfile
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class BarArrays:
+    """
+    Read-only memory-mapped OHLCV columns for one symbol/interval
+
+    The file holds a single (6, n) int64 block: row 0 is the epoch
+    timestamp in nanoseconds (UTC) and rows 1-5 are the float64 bit
+    patterns of Open, High, Low, Close and Volume. Every column is a
+    contiguous view into the mapped pages, so readers in any process
+    share them without copying.
+    """
+
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'tz')
+
+    def __init__(self, block, tz='Asia/Kolkata'):
+        self.timestamp = block[0]
+        self.open, self.high, self.low, self.close, self.volume = block[1:].view(np.float64)
+        self.tz = tz
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def to_frame(self):
+        """
+        Copy the arrays into a DataFrame
+
+        Returns:
+            DataFrame with OHLCV columns and a tz-aware DatetimeIndex
+        """
+        index = pd.to_datetime(np.asarray(self.timestamp), utc=True).tz_convert(self.tz)
+        return pd.DataFrame({
+            'Open': np.asarray(self.open),
+            'High': np.asarray(self.high),
+            'Low': np.asarray(self.low),
+            'Close': np.asarray(self.close),
+            'Volume': np.asarray(self.volume)
+        }, index=index)
+
+
+def bar_arrays_path(root, symbol, interval, period):
+    """
+    Get the file path for a (symbol, interval, period) key
+
+    Args:
+        root: Directory holding the mapped files
+        symbol: Stock symbol
+        interval: Data interval
+        period: Data period
+
+    Returns:
+        Path to the .npy file
+    """
+    return os.path.join(root, f"{quote(symbol, safe='')}__{interval}__{period}.npy")
+
+
+def write_bar_arrays(path, data):
+    """
+    Publish a DataFrame as a memory-mappable file
+
+    The file is written next to its target and renamed over it, so readers
+    that already mapped the old file keep a consistent snapshot.
+
+    Args:
+        path: Target file path
+        data: DataFrame with OHLCV columns and a tz-aware DatetimeIndex
+    """
+    block = np.empty((6, len(data)), dtype=np.int64)
+    block[0] = data.index.tz_convert('UTC').as_unit('ns').asi8
+    prices = block[1:].view(np.float64)
+    for row, column in enumerate(PRICE_COLUMNS):
+        prices[row] = data[column].to_numpy(dtype=np.float64)
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, block)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def open_bar_arrays(path, tz='Asia/Kolkata'):
+    """
+    Map a published file read-only
+
+    Args:
+        path: File path written by write_bar_arrays
+        tz: Timezone for to_frame conversion
+
+    Returns:
+        BarArrays, or None if the file does not exist
+    """
+    try:
+        return BarArrays(np.load(path, mmap_mode='r'), tz)
+    except FileNotFoundError:
+        return None
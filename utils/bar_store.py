@@ -0,0 +1,257 @@
+import os
+import threading
+from utils.bar_arrays import bar_arrays_path, open_bar_arrays, write_bar_arrays
+from utils.disk_cache import DiskBarCache
+from utils.market_calendar import get_ist_time, next_bar_close
+
+
+class BarStore:
+    """Process-wide OHLCV bar cache shared by all scanners"""
+
+    def __init__(self, disk_cache=None, mmap_dir=None, refresh_interval='15m'):
+        """
+        Args:
+            disk_cache: DiskBarCache persisting tracked series, or None
+            mmap_dir: Directory to publish memory-mapped bars in, or None
+            refresh_interval: Cadence at which entries whose last bar is
+                still forming are refreshed (the finest scan timeframe)
+        """
+        self.disk_cache = disk_cache
+        self.mmap_dir = mmap_dir
+        self.refresh_interval = refresh_interval
+        self._entries = {}
+        self._series = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol, interval, period):
+        """
+        Get cached bars if they are still current
+
+        An entry is valid until the next bar close of its interval after
+        it was stored, so every scanner in a cycle sees the same series.
+        While its last bar is still forming it is only valid until the
+        next close of refresh_interval, so a daily series scanned every
+        15 minutes follows the forming candle.
+
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            period: Data period
+
+        Returns:
+            DataFrame with OHLCV data, or None if missing or expired
+        """
+        key = (symbol, interval, period)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or get_ist_time() >= entry['expires_at']:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry['data']
+
+    def put(self, symbol, interval, period, data):
+        """
+        Store bars for a (symbol, interval, period) key
+
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            period: Data period
+            data: DataFrame with OHLCV data
+        """
+        now = get_ist_time()
+
+        with self._lock:
+            self._entries[(symbol, interval, period)] = {
+                'data': data,
+                'arrays': None,
+                'fetched_at': now,
+                'expires_at': self._expires_at(interval, data, now)
+            }
+
+    def _expires_at(self, interval, data, now):
+        """Get when an entry stored now stops being current"""
+        expires_at = next_bar_close(interval, now)
+
+        # The last bar closes after now: it is still forming
+        if len(data) and next_bar_close(interval, data.index[-1]) > now:
+            expires_at = min(expires_at, next_bar_close(self.refresh_interval, now))
+
+        return expires_at
+
+    def get_arrays(self, symbol, interval, period):
+        """
+        Get current bars as memory-mapped NumPy columns
+
+        The file is written on the first call for an entry, so bars nobody
+        maps never touch the disk. Worker processes can then map the same
+        file directly with
+        open_bar_arrays(bar_arrays_path(mmap_dir, symbol, interval, period)).
+
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            period: Data period
+
+        Returns:
+            BarArrays, or None if missing, expired or it could not be published
+        """
+        if self.mmap_dir is None:
+            return None
+
+        key = (symbol, interval, period)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or get_ist_time() >= entry['expires_at']:
+                return None
+
+            if entry['arrays'] is not None:
+                return entry['arrays']
+
+        # Publish outside the lock; concurrent publishers write identical files
+        path = bar_arrays_path(self.mmap_dir, *key)
+        try:
+            write_bar_arrays(path, entry['data'])
+            arrays = open_bar_arrays(path, str(entry['data'].index.tz))
+        except Exception as e:
+            print(f"Error publishing bar arrays for {symbol}: {e}")
+            return None
+
+        with self._lock:
+            if entry['arrays'] is None:
+                entry['arrays'] = arrays
+            return entry['arrays']
+
+    def get_series(self, symbol, interval):
+        """
+        Get the tracked raw series used for incremental fetching
+
+        Args:
+            symbol: Stock symbol
+            interval: Download interval (as requested from the data source)
+
+        Returns:
+            Dict with 'data' (DataFrame), 'covers_from' (earliest date the
+            series is complete from) and 'updated_at' (when it was last
+            downloaded), or None if not tracked
+        """
+        with self._lock:
+            entry = self._series.get((symbol, interval))
+
+        if entry is None and self.disk_cache is not None:
+            entry = self._load_series(symbol, interval)
+
+        return entry
+
+    def put_series(self, symbol, interval, data, covers_from):
+        """
+        Track the raw series for a (symbol, interval) key
+
+        Args:
+            symbol: Stock symbol
+            interval: Download interval (as requested from the data source)
+            data: DataFrame with raw OHLCV bars
+            covers_from: Earliest date the series is complete from
+        """
+        with self._lock:
+            self._series[(symbol, interval)] = {
+                'data': data,
+                'covers_from': covers_from,
+                'updated_at': get_ist_time()
+            }
+
+        if self.disk_cache is not None:
+            self.disk_cache.save(symbol, interval, data, covers_from)
+
+    def _load_series(self, symbol, interval):
+        """Load a tracked series from the disk cache into memory"""
+        cached = self.disk_cache.load(symbol, interval)
+        if cached is None:
+            return None
+
+        data, covers_from, saved_at = cached
+        entry = {'data': data, 'covers_from': covers_from, 'updated_at': saved_at}
+
+        with self._lock:
+            self._series.setdefault((symbol, interval), entry)
+            return self._series[(symbol, interval)]
+
+    def warm_start(self):
+        """
+        Load every series in the disk cache into memory
+
+        Returns:
+            Number of series loaded
+        """
+        if self.disk_cache is None:
+            return 0
+
+        loaded = 0
+        for symbol, interval in self.disk_cache.entries():
+            if self._load_series(symbol, interval) is not None:
+                loaded += 1
+
+        return loaded
+
+    def purge_expired(self):
+        """
+        Drop entries whose bar has closed
+
+        Returns:
+            Number of entries removed
+        """
+        now = get_ist_time()
+
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if now >= entry['expires_at']]
+            for key in expired:
+                del self._entries[key]
+
+        return len(expired)
+
+    def clear(self):
+        """Drop all cached bars"""
+        with self._lock:
+            self._entries.clear()
+            self._series.clear()
+
+    def stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            Dict with entry count, tracked series count, hits and misses
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'series': len(self._series),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+# Raw series persist across restarts under NSE_SCREENER_CACHE_DIR (default .cache/bars);
+# current bars are published for memory mapping under NSE_SCREENER_MMAP_DIR (default .cache/mmap);
+# forming bars are refreshed every NSE_SCREENER_REFRESH_INTERVAL (default 15m)
+_bar_store = BarStore(
+    DiskBarCache(
+        os.environ.get('NSE_SCREENER_CACHE_DIR', os.path.join('.cache', 'bars')),
+        max_bytes=int(os.environ.get('NSE_SCREENER_CACHE_MAX_MB', '256')) * 1024 * 1024
+    ),
+    mmap_dir=os.environ.get('NSE_SCREENER_MMAP_DIR', os.path.join('.cache', 'mmap')),
+    refresh_interval=os.environ.get('NSE_SCREENER_REFRESH_INTERVAL', '15m')
+)
+
+
+def get_bar_store():
+    """Get the process-wide bar store"""
+    return _bar_store
@@ -1,21 +1,53 @@
-import yfinance as yf
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
-import time
+from datetime import datetime
 import os
+from utils.bar_store import get_bar_store
+from utils.data_quality import get_data_quality, repair_series, validate_batch
+from utils.fetch_executor import get_fetch_executor
+from utils.market_calendar import get_ist_time, period_start
+from utils.providers import get_provider
+from utils.quote_cache import get_quote_cache, quotes_from_bars
+from utils.resilience import NoDataError, get_resilient_caller
+from utils.rollup import ROLLUP_BASE, aggregate_bars, get_bar_rollup
+from utils.streaming_indicators import get_indicator_streams
+from utils.universe import get_universe
+
+# Columns kept from provider downloads
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Days of history the provider serves per base interval (Yahoo keeps hourly bars for 730 days)
+BASE_HISTORY_DAYS = {'1h': 730}
+
+# Intervals the provider serves directly, used when a period is too long to derive them
+PROVIDER_INTERVALS = {'1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '1d', '5d', '1wk', '1mo', '3mo'}
+
+# Oldest tracked series served in place of fresh data while the provider is failing
+STALE_MAX_AGE = pd.Timedelta(minutes=int(os.environ.get('NSE_SCREENER_STALE_MAX_AGE_MIN', '1440')))
+
 
 class DataFetcher:
     """Data fetching utilities for NSE stocks and market data"""
     
-    def __init__(self):
+    def __init__(self, provider=None):
+        self.provider = provider or get_provider()
         self.nse_stocks = self._load_nse_stock_list()
+        self.bar_store = get_bar_store()
+        self.fetch_executor = get_fetch_executor()
+        self.rollup = get_bar_rollup()
+        self.resilience = get_resilient_caller()
+        self.data_quality = get_data_quality()
+        self.quote_cache = get_quote_cache()
     
     def _load_nse_stock_list(self):
         """
         Load NSE stock list
         Returns a list of NSE stock symbols
         """
+        # Symbols come from the universe file (see utils.universe) when available
+        universe = get_universe()
+        if universe is not None and not universe.empty:
+            return universe['symbol'].tolist()
+        
         # Stock symbols - Enhanced list (EXACT SAME as user provided)
         nse_stocks = [
             "ADANIENT.NS", "ADANIPORTS.NS", "APOLLOHOSP.NS", "ASIANPAINT.NS", "AXISBANK.NS",
@@ -41,18 +73,63 @@ class DataFetcher:
         
         return nse_stocks
     
-    def get_nse_stock_list(self):
+    def get_nse_stock_list(self, series=None, sectors=None, max_tier=None):
         """
         Get the list of NSE stocks for scanning
         
+        Args:
+            series: Optional list of series to keep (e.g. ['EQ', 'BE'])
+            sectors: Optional list of sectors to keep
+            max_tier: Optional highest liquidity tier to keep (1 is most liquid)
+        
         Returns:
             List of NSE stock symbols
         """
-        return self.nse_stocks
+        if series is None and sectors is None and max_tier is None:
+            return self.nse_stocks
+        
+        universe = get_universe()
+        if universe is None:
+            return self.nse_stocks
+        
+        mask = universe['symbol'].isin(self.nse_stocks)
+        if series is not None:
+            mask &= universe['series'].isin(series)
+        if sectors is not None:
+            mask &= universe['sector'].isin(sectors)
+        if max_tier is not None:
+            mask &= universe['liquidity_tier'] <= max_tier
+        
+        return universe.loc[mask, 'symbol'].tolist()
+    
+    def get_symbol_info(self, symbol):
+        """
+        Get universe metadata for a symbol
+        
+        Args:
+            symbol: Stock symbol
+            
+        Returns:
+            Dict with sector, series and liquidity_tier, or None if unknown
+        """
+        universe = get_universe()
+        if universe is None:
+            return None
+        
+        rows = universe[universe['symbol'] == symbol]
+        if rows.empty:
+            return None
+        
+        row = rows.iloc[0]
+        return {
+            'sector': row['sector'],
+            'series': row['series'],
+            'liquidity_tier': int(row['liquidity_tier'])
+        }
     
     def get_stock_data(self, symbol, period="60d", interval="1d"):
         """
-        Fetch stock data from Yahoo Finance
+        Fetch stock data from the market data provider
         
         Args:
             symbol: Stock symbol (e.g., 'RELIANCE.NS')
@@ -60,94 +137,499 @@ class DataFetcher:
             interval: Data interval ('1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '1d', '5d', '1wk', '1mo', '3mo')
         
         Returns:
-            DataFrame with OHLCV data
+            DataFrame with OHLCV data (shared with other scanners, do not modify).
+            If the provider is failing or returns no bars, the last good bars
+            are returned with data.attrs['stale'] set, or None if there are
+            none recent enough.
         """
+        # Serve from the shared bar store until the current bar closes
+        cached = self.bar_store.get(symbol, interval, period)
+        if cached is not None:
+            return cached
+        
         try:
-            # Convert interval for yfinance compatibility
-            interval_map = {
-                "15m": "15m",
-                "1h": "1h", 
-                "4h": "1h",  # Will aggregate to 4h later
-                "1d": "1d"
-            }
+            yf_interval = self._yf_interval(interval, period)
             
-            yf_interval = interval_map.get(interval, interval)
+            # Fetch only the bars after the last tracked one when possible
+            start = self._delta_start(symbol, yf_interval, period)
             
-            # Fetch data
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period, interval=yf_interval)
+            raw = self._fetch_bars(
+                self.provider.history, symbol, interval=yf_interval, period=period, start=start
+            )
             
-            if data.empty:
-                return None
+            # Adjusted history no longer lines up with the tracked series: resync
+            if start is not None and self._history_revised(symbol, yf_interval, raw, start):
+                start = None
+                raw = self._fetch_bars(self.provider.history, symbol, interval=yf_interval, period=period)
+                self.rollup.invalidate(symbol)
+                get_indicator_streams().invalidate(symbol)
             
-            # Convert to 4-hour data if requested
-            if interval == "4h" and yf_interval == "1h":
-                data = self._resample_to_4h(data)
+            raw = self._merge_delta(symbol, yf_interval, period, raw, start)
+            data = self._prepare_data(symbol, raw, period, interval)
             
-            # Clean data
-            data = data.dropna()
+            if data is not None:
+                self.bar_store.put(symbol, interval, period, data)
             
             return data
             
         except Exception as e:
             print(f"Error fetching data for {symbol}: {e}")
-            return None
+            return self._stale_data(symbol, period, interval)
     
-    def _resample_to_4h(self, hourly_data):
+    def _fetch(self, fn, *args, **kwargs):
         """
-        Resample hourly data to 4-hour intervals
+        Call the provider through the rate limit, retries and the host's circuit breaker
         
         Args:
-            hourly_data: DataFrame with hourly OHLCV data
+            fn: Provider method to call
+            *args, **kwargs: Arguments passed to fn
             
         Returns:
-            DataFrame resampled to 4-hour intervals
+            Result of fn
         """
-        try:
-            # Resample to 4-hour intervals
-            resampled = hourly_data.resample('4H').agg({
-                'Open': 'first',
-                'High': 'max',
-                'Low': 'min',
-                'Close': 'last',
-                'Volume': 'sum'
-            }).dropna()
+        return self.resilience.call(self.provider.host, self.fetch_executor.call, fn, *args, **kwargs)
+    
+    def _fetch_bars(self, fn, *args, **kwargs):
+        """
+        Fetch bars through _fetch, treating an empty answer as an error
+        
+        The provider answers with nothing for delisted or unknown symbols,
+        and while throttling. An empty answer is not retried and does not
+        count against the host's circuit breaker (only transport errors do);
+        callers fall back to other symbols' requests or to stale bars.
+        
+        Args:
+            fn: Provider method returning a DataFrame or a dict of DataFrames
+            *args, **kwargs: Arguments passed to fn
             
-            return resampled
+        Returns:
+            Non-empty result of fn
             
+        Raises:
+            NoDataError: If the answer was empty
+        """
+        def fetch():
+            result = fn(*args, **kwargs)
+            if result is None or len(result) == 0:
+                raise NoDataError(f"No bars returned by {self.provider.host}")
+            return result
+        
+        return self._fetch(fetch)
+    
+    def _stale_data(self, symbol, period, interval):
+        """
+        Get the last good bars for a symbol while the provider is failing
+        
+        Built from the tracked raw series (kept in memory and on disk), as
+        long as it was downloaded within STALE_MAX_AGE. Stale bars are not
+        stored in the bar store, so the next request tries the provider again.
+        
+        Args:
+            symbol: Stock symbol
+            period: Data period
+            interval: Data interval
+            
+        Returns:
+            DataFrame with data.attrs['stale'] and data.attrs['as_of'] set,
+            or None if no recent series is tracked
+        """
+        entry = self.bar_store.get_series(symbol, self._yf_interval(interval, period))
+        
+        if entry is None or get_ist_time() - entry['updated_at'] > STALE_MAX_AGE:
+            return None
+        
+        try:
+            data = self._prepare_data(symbol, entry['data'], period, interval)
         except Exception as e:
-            print(f"Error resampling to 4h: {e}")
-            return hourly_data
+            print(f"Error preparing cached data for {symbol}: {e}")
+            return None
+        
+        if data is None:
+            return None
+        
+        data = data.copy()
+        data.attrs['stale'] = True
+        data.attrs['as_of'] = entry['updated_at']
+        
+        return data
+    
+    def get_bar_arrays(self, symbol, period="60d", interval="1d"):
+        """
+        Get stock data as read-only memory-mapped NumPy columns
+        
+        Args:
+            symbol: Stock symbol (e.g., 'RELIANCE.NS')
+            period: Data period
+            interval: Data interval
+            
+        Returns:
+            BarArrays with timestamp, open, high, low, close and volume arrays,
+            or None if no data is available
+        """
+        arrays = self.bar_store.get_arrays(symbol, interval, period)
+        
+        if arrays is None and self.get_stock_data(symbol, period, interval) is not None:
+            arrays = self.bar_store.get_arrays(symbol, interval, period)
+        
+        return arrays
+    
+    def _yf_interval(self, interval, period):
+        """
+        Get the interval to download for a requested interval
+        
+        Coarser intervals (4h, 1d) are derived locally from hourly bars, so
+        every timeframe of a symbol comes from one download. Periods reaching
+        further back than the provider keeps hourly bars (5y, max, ...) are
+        downloaded at the requested interval instead, where it has one.
+        
+        Args:
+            interval: Requested data interval
+            period: Data period
+            
+        Returns:
+            Interval string to request from the provider
+        """
+        base = ROLLUP_BASE.get(interval, interval)
+        
+        if base != interval and base in BASE_HISTORY_DAYS and interval in PROVIDER_INTERVALS:
+            period_start = self._period_start(period)
+            history = pd.Timedelta(days=BASE_HISTORY_DAYS[base])
+            
+            if period_start is None or self.provider.now() - period_start > history:
+                return interval
+        
+        return base
+    
+    def _prepare_data(self, symbol, data, period, interval):
+        """
+        Aggregate, trim and clean raw provider bars
+        
+        Args:
+            symbol: Stock symbol
+            data: DataFrame with the downloaded (or tracked) base bars
+            period: Data period
+            interval: Requested data interval
+            
+        Returns:
+            Clean DataFrame with OHLCV data, or None if empty
+        """
+        if data is None or data.empty:
+            return None
+        
+        period_start = self._period_start(period)
+        
+        # Derive coarser bars from the base series
+        if interval != self._yf_interval(interval, period):
+            if period_start is not None:
+                data = self.rollup.derive(symbol, data, interval)
+            else:
+                data = aggregate_bars(data, interval)
+        
+        if period_start is not None:
+            data = data[data.index >= period_start]
+        
+        # Clean data
+        data = data.dropna()
+        
+        if data.empty:
+            return None
+        
+        return data
     
-    def get_multiple_stocks_data(self, symbols, period="60d", interval="1d"):
+    def _period_start(self, period):
+        """
+        Get the first calendar day covered by a period string
+        
+        Args:
+            period: Data period ('60d', '3mo', '1y', ...)
+            
+        Returns:
+            tz-aware IST Timestamp at midnight, or None for open-ended periods
+        """
+        return period_start(period, self.provider.now())
+    
+    def _delta_start(self, symbol, yf_interval, period):
+        """
+        Get the timestamp to resume downloading from
+        
+        Args:
+            symbol: Stock symbol
+            yf_interval: Download interval
+            period: Data period
+            
+        Returns:
+            Timestamp of the last tracked bar, or None if a full download is needed
+        """
+        period_start = self._period_start(period)
+        entry = self.bar_store.get_series(symbol, yf_interval)
+        
+        if period_start is None or entry is None or entry['covers_from'] > period_start:
+            return None
+        
+        return entry['data'].index[-1]
+    
+    def _history_revised(self, symbol, yf_interval, raw, start):
+        """
+        Check whether the provider has revised the bars of the tracked series
+        
+        Prices are downloaded split- and dividend-adjusted, so a corporate
+        action rescales every earlier bar. A delta download starts at the
+        last tracked bar, whose open is final once the bar has started; if
+        that bar is gone or its open differs, the tracked history is stale
+        and the whole period has to be downloaded again.
+        
+        Args:
+            symbol: Stock symbol
+            yf_interval: Download interval
+            raw: DataFrame with the delta download
+            start: Timestamp of the last tracked bar
+            
+        Returns:
+            Boolean indicating if a full download is needed
+        """
+        entry = self.bar_store.get_series(symbol, yf_interval)
+        overlap = raw['Open'][raw.index == start].dropna()
+        
+        if entry is None or overlap.empty:
+            return True
+        
+        tracked = float(entry['data']['Open'].iloc[-1])
+        return abs(float(overlap.iloc[-1]) - tracked) > 1e-6 * abs(tracked)
+    
+    def _merge_delta(self, symbol, yf_interval, period, raw, start):
+        """
+        Merge freshly downloaded bars into the tracked series
+        
+        The last tracked bar may still have been forming when it was
+        downloaded, so it is replaced by the new download rather than kept.
+        
+        Args:
+            symbol: Stock symbol
+            yf_interval: Download interval
+            period: Data period
+            raw: DataFrame with the downloaded bars
+            start: Timestamp the download resumed from, or None for a full download
+            
+        Returns:
+            DataFrame with the whole tracked series (trimmed to the period later)
+        """
+        period_start = self._period_start(period)
+        
+        if raw is not None and not raw.empty:
+            # Single-ticker and batched downloads return different extra columns
+            raw = raw[[column for column in OHLCV_COLUMNS if column in raw.columns]]
+        
+        if start is None:
+            if raw is not None and not raw.empty and period_start is not None:
+                self.bar_store.put_series(symbol, yf_interval, raw, period_start)
+            return raw
+        
+        entry = self.bar_store.get_series(symbol, yf_interval)
+        series = entry['data']
+        
+        if raw is not None and not raw.empty:
+            series = pd.concat([series[series.index < raw.index[0]], raw])
+            series = series[~series.index.duplicated(keep='last')]
+            self.bar_store.put_series(symbol, yf_interval, series, entry['covers_from'])
+        
+        return series
+    
+    def get_multiple_stocks_data(self, symbols, period="60d", interval="1d", chunk_size=20):
         """
         Fetch data for multiple stocks
         
+        Symbols not already in the bar store are downloaded in batches of
+        chunk_size tickers per request and split back into one DataFrame
+        per symbol. Batches run concurrently on the shared fetch executor.
+        Symbols of failed batches, and symbols a batch came back without,
+        are retried one by one, which falls back to stale bars (see
+        get_stock_data). All returned series then go
+        through one data-quality pass (see _check_quality).
+        
         Args:
             symbols: List of stock symbols
             period: Data period
             interval: Data interval
+            chunk_size: Maximum number of tickers per download request
             
         Returns:
             Dict with symbol as key and DataFrame as value
         """
         stock_data = {}
+        missing = []
         
         for symbol in symbols:
-            try:
-                data = self.get_stock_data(symbol, period, interval)
-                if data is not None:
-                    stock_data[symbol] = data
+            cached = self.bar_store.get(symbol, interval, period)
+            if cached is not None:
+                stock_data[symbol] = cached
+            else:
+                missing.append(symbol)
+        
+        chunks = [missing[start:start + chunk_size] for start in range(0, len(missing), chunk_size)]
+        failed = []
+        
+        for chunk, result, error in self.fetch_executor.map(
+                lambda chunk: self._download_chunk(chunk, period, interval), chunks):
+            if error is None:
+                stock_data.update(result)
+                # Throttled downloads omit tickers instead of failing
+                failed.extend(symbol for symbol in chunk if symbol not in result)
+            else:
+                print(f"Error fetching batch starting at {chunk[0]}: {error}")
+                failed.extend(chunk)
+        
+        # Fall back to one request per symbol for failed batches
+        for symbol, data, error in self.fetch_executor.map(
+                lambda symbol: self.get_stock_data(symbol, period, interval), failed):
+            if data is not None:
+                stock_data[symbol] = data
+        
+        # Keep the caller's symbol order
+        stock_data = {symbol: stock_data[symbol] for symbol in symbols if symbol in stock_data}
+        
+        return self._check_quality(stock_data, period, interval)
+    
+    def _check_quality(self, stock_data, period, interval):
+        """
+        Validate a batch of series, repairing what can be repaired
+        
+        Series with duplicate or out-of-order bars are sorted and
+        de-duplicated (and re-stored). Every series gets its flags in
+        data.attrs['quality'], and the batch report is recorded in the
+        data quality registry for the UI.
+        
+        Args:
+            stock_data: Dict with symbol as key and DataFrame as value
+            period: Data period
+            interval: Data interval
+            
+        Returns:
+            Dict with symbol as key and (repaired) DataFrame as value
+        """
+        try:
+            report = validate_batch(stock_data, interval)
+        except Exception as e:
+            print(f"Error validating {interval} data: {e}")
+            return stock_data
+        
+        self.data_quality.update(report)
+        
+        for symbol, flags in zip(report.index, report.to_dict('records')):
+            data = stock_data[symbol]
+            
+            if flags['duplicates'] or flags['unordered']:
+                data = repair_series(data)
+                if not data.attrs.get('stale'):
+                    self.bar_store.put(symbol, interval, period, data)
+                stock_data[symbol] = data
+            
+            data.attrs['quality'] = flags
+        
+        return stock_data
+    
+    def _download_chunk(self, symbols, period, interval):
+        """
+        Download several tickers in one request and split them per symbol
+        
+        Symbols with a tracked series only fetch the bars after their last
+        one; the rest are downloaded for the whole period. Symbols missing
+        from the download, or whose history was revised since it was
+        tracked (see _history_revised), are left out of the result, so the
+        caller can retry them one by one.
+        
+        Args:
+            symbols: List of stock symbols
+            period: Data period
+            interval: Data interval
+            
+        Returns:
+            Dict with symbol as key and DataFrame as value
+        """
+        yf_interval = self._yf_interval(interval, period)
+        starts = {symbol: self._delta_start(symbol, yf_interval, period) for symbol in symbols}
+        
+        full = [symbol for symbol in symbols if starts[symbol] is None]
+        incremental = [symbol for symbol in symbols if starts[symbol] is not None]
+        
+        stock_data = {}
+        
+        for group in (full, incremental):
+            if not group:
+                continue
+            
+            if group is full:
+                downloaded = self._fetch_bars(
+                    self.provider.download, group, interval=yf_interval, period=period
+                )
+            else:
+                start = min(starts[symbol] for symbol in group)
+                downloaded = self._fetch_bars(
+                    self.provider.download, group, interval=yf_interval, start=start
+                )
+            
+            for symbol in group:
+                raw = downloaded.get(symbol)
+                if raw is None or raw.empty:
+                    continue
                 
-                # Small delay to avoid rate limiting
-                time.sleep(0.1)
+                if group is incremental and self._history_revised(symbol, yf_interval, raw, starts[symbol]):
+                    continue
                 
-            except Exception as e:
-                print(f"Error fetching {symbol}: {e}")
-                continue
+                raw = self._merge_delta(symbol, yf_interval, period, raw, starts[symbol])
+                data = self._prepare_data(symbol, raw, period, interval)
+                
+                if data is not None:
+                    self.bar_store.put(symbol, interval, period, data)
+                    stock_data[symbol] = data
         
         return stock_data
     
+    def get_quote_snapshot(self, symbols=None, chunk_size=100):
+        """
+        Get latest quotes for many symbols at once
+        
+        Quotes come from the last two daily bars of each symbol, downloaded
+        chunk_size tickers per request, and are cached for a short TTL
+        (see utils.quote_cache).
+        
+        Args:
+            symbols: List of stock symbols (defaults to the whole universe)
+            chunk_size: Maximum number of tickers per download request
+            
+        Returns:
+            DataFrame indexed by symbol with price, previous_close, change,
+            change_percent, volume and as_of columns
+        """
+        symbols = self.nse_stocks if symbols is None else symbols
+        
+        return self.quote_cache.get(symbols, lambda stale: self._download_quotes(stale, chunk_size))
+    
+    def _download_quotes(self, symbols, chunk_size):
+        """
+        Download recent daily bars in batches and reduce them to quotes
+        
+        Symbols a batch comes back without get no quote; the quote cache
+        requests them again on the next snapshot.
+        
+        Args:
+            symbols: List of stock symbols
+            chunk_size: Maximum number of tickers per download request
+            
+        Returns:
+            DataFrame like quotes_from_bars
+        """
+        chunks = [symbols[start:start + chunk_size] for start in range(0, len(symbols), chunk_size)]
+        stock_data = {}
+        
+        for chunk, result, error in self.fetch_executor.map(
+                lambda chunk: self._fetch(self.provider.download, chunk, interval="1d", period="5d"), chunks):
+            if error is None:
+                stock_data.update(result)
+            else:
+                print(f"Error fetching quotes starting at {chunk[0]}: {error}")
+        
+        return quotes_from_bars(stock_data)
+    
     def get_latest_price(self, symbol):
         """
         Get the latest price for a stock
@@ -156,21 +638,25 @@ class DataFetcher:
             symbol: Stock symbol
             
         Returns:
-            Dict with latest price information
+            Dict with latest price information (market_cap is not part of
+            the quote snapshot and is always 0)
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            quotes = self.get_quote_snapshot([symbol])
+            
+            if symbol not in quotes.index:
+                return None
+            
+            quote = quotes.loc[symbol]
             
             return {
                 'symbol': symbol,
-                'current_price': info.get('currentPrice', 0),
-                'previous_close': info.get('previousClose', 0),
-                'change': info.get('currentPrice', 0) - info.get('previousClose', 0),
-                'change_percent': ((info.get('currentPrice', 0) - info.get('previousClose', 0)) / 
-                                 info.get('previousClose', 1)) * 100 if info.get('previousClose') else 0,
-                'volume': info.get('volume', 0),
-                'market_cap': info.get('marketCap', 0)
+                'current_price': float(quote['price']),
+                'previous_close': float(quote['previous_close']),
+                'change': float(quote['change']),
+                'change_percent': float(quote['change_percent']),
+                'volume': float(quote['volume']),
+                'market_cap': 0
             }
             
         except Exception as e:
@@ -212,8 +698,7 @@ class DataFetcher:
             Boolean indicating if symbol is valid
         """
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="5d", interval="1d")
+            data = self._fetch(self.provider.history, symbol, interval="1d", period="5d")
             
             return not data.empty
             
@@ -0,0 +1,191 @@
+import threading
+import numpy as np
+import pandas as pd
+from utils.market_calendar import IST, interval_minutes
+from utils.session_bars import session_bin_edges
+
+# Trailing bars with no range and no volume that mark a frozen last candle
+FROZEN_BARS = 3
+
+QUALITY_COLUMNS = ['interval', 'bars', 'duplicates', 'unordered', 'bad_ohlc',
+                   'missing_bars', 'lagging', 'frozen', 'ok']
+
+
+def validate_batch(stock_data, interval):
+    """
+    Check a batch of series against the session calendar in one vectorized pass
+
+    All series are concatenated into flat arrays tagged with a series
+    number, so every check is a handful of NumPy operations regardless of
+    the number of symbols. Checks per series:
+
+    - duplicates / unordered: repeated or out-of-order timestamps
+    - bad_ohlc: High below Open/Close, Low above Open/Close or non-positive Low
+    - missing_bars: session bars between the series' first and last bar
+      that it lacks. Exchange holidays are not tracked, so a bar counts as
+      expected only if at least one series in the batch has it.
+    - lagging: the series ends before the latest bar the batch has
+    - frozen: the last FROZEN_BARS bars have no range, no volume and the same close
+
+    Args:
+        stock_data: Dict with symbol as key and OHLCV DataFrame as value
+        interval: Bar interval of the series
+
+    Returns:
+        DataFrame indexed by symbol with QUALITY_COLUMNS
+    """
+    symbols = [symbol for symbol, data in stock_data.items() if data is not None and not data.empty]
+
+    if not symbols:
+        return pd.DataFrame(columns=QUALITY_COLUMNS)
+
+    frames = [stock_data[symbol] for symbol in symbols]
+    n = len(frames)
+    lengths = np.array([len(data) for data in frames])
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    group = np.repeat(np.arange(n), lengths)
+    timestamps = np.concatenate([data.index.as_unit('ns').asi8 for data in frames])
+    same_series = group[1:] == group[:-1]
+
+    # Out-of-order timestamps are counted before sorting each series
+    unordered = np.bincount(group[1:][same_series & (np.diff(timestamps) < 0)], minlength=n)
+
+    order = np.lexsort((timestamps, group))
+    timestamps = timestamps[order]
+    open_, high, low, close, volume = (
+        np.concatenate([data[column].to_numpy(dtype=np.float64) for data in frames])[order]
+        for column in ['Open', 'High', 'Low', 'Close', 'Volume']
+    )
+
+    duplicates = np.bincount(group[1:][same_series & (np.diff(timestamps) == 0)], minlength=n)
+
+    bad = (high < np.maximum(open_, close)) | (low > np.minimum(open_, close)) | (low <= 0)
+    bad_ohlc = np.bincount(group[bad], minlength=n)
+
+    ends = starts + lengths - 1
+    missing_bars = np.zeros(n, dtype=np.int64)
+    lagging = np.zeros(n, dtype=bool)
+
+    if interval_minutes(interval) is not None or interval == '1d':
+        first_day = pd.Timestamp(timestamps.min(), tz='UTC').tz_convert(IST).date()
+        last_day = pd.Timestamp(timestamps.max(), tz='UTC').tz_convert(IST).date()
+        edges = session_bin_edges(first_day, last_day, interval)
+        ids = np.maximum(np.searchsorted(edges, timestamps, side='right') - 1, 0)
+
+        # Bars traded by at least one series form the expected calendar
+        traded = np.zeros(len(edges), dtype=bool)
+        traded[ids] = True
+        traded_count = np.cumsum(traded)
+
+        expected = traded_count[ids[ends]] - traded_count[ids[starts]] + 1
+        new_bar = np.ones(len(ids), dtype=bool)
+        new_bar[1:] = (ids[1:] != ids[:-1]) | ~same_series
+        observed = np.bincount(group[new_bar], minlength=n)
+
+        missing_bars = np.maximum(expected - observed, 0)
+        lagging = ids[ends] < ids[ends].max()
+
+    frozen = np.zeros(n, dtype=bool)
+    tail = lengths >= FROZEN_BARS
+    if tail.any():
+        rows = ends[tail][:, None] - np.arange(FROZEN_BARS)[None, :]
+        frozen[tail] = (
+            (high[rows] == low[rows]).all(axis=1)
+            & (volume[rows] == 0).all(axis=1)
+            & (close[rows] == close[rows][:, :1]).all(axis=1)
+        )
+
+    report = pd.DataFrame({
+        'interval': interval,
+        'bars': lengths,
+        'duplicates': duplicates,
+        'unordered': unordered,
+        'bad_ohlc': bad_ohlc,
+        'missing_bars': missing_bars,
+        'lagging': lagging,
+        'frozen': frozen
+    }, index=pd.Index(symbols, name='symbol'))
+
+    report['ok'] = ~(
+        (report[['duplicates', 'unordered', 'bad_ohlc', 'missing_bars']] > 0).any(axis=1)
+        | report['lagging'] | report['frozen']
+    )
+
+    return report[QUALITY_COLUMNS]
+
+
+def repair_series(data):
+    """
+    Sort a series and drop duplicate timestamps, keeping the last bar
+
+    Args:
+        data: OHLCV DataFrame
+
+    Returns:
+        Repaired DataFrame
+    """
+    data = data.sort_index(kind='stable')
+    return data[~data.index.duplicated(keep='last')]
+
+
+class DataQualityRegistry:
+    """Latest quality flags per (symbol, interval), for scanners and the UI"""
+
+    def __init__(self):
+        self._reports = {}
+        self._lock = threading.Lock()
+
+    def update(self, report):
+        """
+        Record a validation report
+
+        Args:
+            report: DataFrame returned by validate_batch
+        """
+        with self._lock:
+            for symbol, row in zip(report.index, report.to_dict('records')):
+                self._reports[(symbol, row['interval'])] = row
+
+    def get(self, symbol, interval):
+        """
+        Get the latest flags for a series
+
+        Returns:
+            Dict with QUALITY_COLUMNS values, or None if never validated
+        """
+        with self._lock:
+            return self._reports.get((symbol, interval))
+
+    def report(self, flagged_only=False):
+        """
+        Get the latest flags for every validated series
+
+        Args:
+            flagged_only: Only include series that failed a check
+
+        Returns:
+            DataFrame with symbol and QUALITY_COLUMNS
+        """
+        with self._lock:
+            rows = [{'symbol': symbol, **row} for (symbol, _), row in self._reports.items()]
+
+        report = pd.DataFrame(rows, columns=['symbol'] + QUALITY_COLUMNS)
+
+        if flagged_only:
+            report = report[~report['ok'].astype(bool)]
+
+        return report.reset_index(drop=True)
+
+    def clear(self):
+        """Drop all recorded flags"""
+        with self._lock:
+            self._reports.clear()
+
+
+_data_quality = DataQualityRegistry()
+
+
+def get_data_quality():
+    """Get the process-wide data quality registry"""
+    return _data_quality
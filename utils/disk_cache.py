@@ -0,0 +1,201 @@
+import os
+import tempfile
+import threading
+from urllib.parse import quote, unquote
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes; files with another version are discarded
+SCHEMA_VERSION = 2
+
+# Eviction frees space down to this fraction of max_bytes, so it runs once per many saves
+EVICT_TO = 0.9
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class DiskBarCache:
+    """On-disk columnar cache of raw OHLCV series, one .npz file per symbol/interval"""
+
+    def __init__(self, cache_dir, max_bytes=256 * 1024 * 1024, read_only=False):
+        """
+        Args:
+            cache_dir: Directory holding the .npz files
+            max_bytes: Size above which least recently used files are evicted
+            read_only: Never write, touch or delete files (for replaying a
+                       recorded directory)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        # Bytes on disk, counted by evict() and kept current by save()
+        self._total_bytes = None
+
+    def _path(self, symbol, interval):
+        """Get the file path for a (symbol, interval) key"""
+        return os.path.join(self.cache_dir, f"{quote(symbol, safe='')}__{interval}.npz")
+
+    def load(self, symbol, interval):
+        """
+        Load a cached series
+
+        Args:
+            symbol: Stock symbol
+            interval: Download interval
+
+        Returns:
+            Tuple of (DataFrame, covers_from Timestamp, saved_at Timestamp),
+            or None if not cached
+        """
+        path = self._path(symbol, interval)
+
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                if int(arrays['schema_version']) != SCHEMA_VERSION:
+                    if not self.read_only:
+                        self._remove(path)
+                    return None
+
+                tz = str(arrays['tz'])
+                index = pd.to_datetime(arrays['timestamp'], utc=True).tz_convert(tz)
+                data = pd.DataFrame(
+                    {column: arrays[column] for column in PRICE_COLUMNS},
+                    index=index
+                )
+                covers_from = pd.Timestamp(int(arrays['covers_from']), tz='UTC').tz_convert(tz)
+                saved_at = pd.Timestamp(int(arrays['saved_at']), tz='UTC').tz_convert(tz)
+
+            # Touch the file so eviction keeps recently used series
+            if not self.read_only:
+                os.utime(path)
+
+            return data, covers_from, saved_at
+
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading cached bars for {symbol}: {e}")
+            if not self.read_only:
+                self._remove(path)
+            return None
+
+    def save(self, symbol, interval, data, covers_from):
+        """
+        Write a series atomically and evict old files if over the size limit
+
+        The cache size is tracked as files are written, so the directory is
+        only listed when the limit is exceeded (and on the first save).
+
+        Args:
+            symbol: Stock symbol
+            interval: Download interval
+            data: DataFrame with OHLCV columns and a tz-aware DatetimeIndex
+            covers_from: Earliest date the series is complete from
+        """
+        if self.read_only:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            arrays = {
+                'schema_version': np.array(SCHEMA_VERSION),
+                'tz': np.array(str(data.index.tz)),
+                'timestamp': data.index.tz_convert('UTC').as_unit('ns').asi8,
+                'covers_from': np.array(pd.Timestamp(covers_from).tz_convert('UTC').value),
+                'saved_at': np.array(pd.Timestamp.now(tz='UTC').value)
+            }
+            for column in PRICE_COLUMNS:
+                arrays[column] = data[column].to_numpy(dtype=np.float64)
+
+            path = self._path(symbol, interval)
+
+            # Write to a temporary file in the same directory, then rename over the target
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f, **arrays)
+                size = os.path.getsize(tmp_path)
+                previous = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+            except Exception:
+                self._remove(tmp_path)
+                raise
+
+            with self._lock:
+                if self._total_bytes is not None:
+                    self._total_bytes += size - previous
+                over_limit = self._total_bytes is None or self._total_bytes > self.max_bytes
+
+            if over_limit:
+                self.evict()
+
+        except Exception as e:
+            print(f"Error caching bars for {symbol}: {e}")
+
+    def entries(self):
+        """
+        List cached (symbol, interval) keys
+
+        Returns:
+            List of (symbol, interval) tuples
+        """
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        keys = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npz') and '__' in name:
+                symbol, interval = name[:-4].rsplit('__', 1)
+                keys.append((unquote(symbol), interval))
+
+        return keys
+
+    def evict(self):
+        """
+        Delete least recently used files once the cache exceeds max_bytes
+
+        Files are removed until the cache is down to EVICT_TO of max_bytes.
+
+        Returns:
+            Number of files removed
+        """
+        if self.read_only:
+            return 0
+
+        with self._lock:
+            files = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.npz'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            removed = 0
+
+            if total <= self.max_bytes:
+                self._total_bytes = total
+                return 0
+
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes * EVICT_TO:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+
+            self._total_bytes = total
+            return removed
+
+    def _remove(self, path):
+        """Delete a file, ignoring files that are already gone"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
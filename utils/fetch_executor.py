@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+
+    def __init__(self, rate, capacity):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class FetchExecutor:
+    """Bounded thread pool for network fetches sharing one global rate limit"""
+
+    def __init__(self, max_workers=8, rate=8.0, burst=8):
+        """
+        Args:
+            max_workers: Maximum concurrent fetches
+            rate: Requests per second allowed across all callers
+            burst: Requests allowed back to back before throttling
+        """
+        self.max_workers = max_workers
+        self.limiter = TokenBucket(rate, burst)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=500)
+        self._queued = 0
+        self._in_flight = 0
+        self._requests = 0
+        self._errors = 0
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Run one network request in the current thread under the rate limit
+
+        Args:
+            fn: Callable that performs the request
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            Result of fn
+        """
+        self.limiter.acquire()
+
+        with self._lock:
+            self._in_flight += 1
+
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            with self._lock:
+                self._in_flight -= 1
+                self._requests += 1
+                self._latencies.append(latency)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Run a task on the fetch pool
+
+        Tasks should make their requests through call() so they share the
+        rate limit. Tasks must not wait on other pool tasks.
+
+        Args:
+            fn: Callable to run
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            concurrent.futures.Future
+        """
+        with self._lock:
+            self._queued += 1
+
+        def run():
+            with self._lock:
+                self._queued -= 1
+            return fn(*args, **kwargs)
+
+        return self._pool.submit(run)
+
+    def map(self, fn, items):
+        """
+        Run fn over items on the fetch pool
+
+        Args:
+            fn: Callable taking one item
+            items: Iterable of items
+
+        Returns:
+            List of (item, result, error) tuples in input order
+        """
+        futures = [(item, self.submit(fn, item)) for item in items]
+        results = []
+
+        for item, future in futures:
+            try:
+                results.append((item, future.result(), None))
+            except Exception as e:
+                results.append((item, None, e))
+
+        return results
+
+    def stats(self):
+        """
+        Get request statistics
+
+        Returns:
+            Dict with request and error counts, queue depth, in-flight
+            requests and latency figures in seconds
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+            return {
+                'requests': self._requests,
+                'errors': self._errors,
+                'queue_depth': self._queued,
+                'in_flight': self._in_flight,
+                'avg_latency': sum(latencies) / len(latencies) if latencies else 0,
+                'p95_latency': latencies[int(len(latencies) * 0.95) - 1] if latencies else 0,
+                'max_latency': latencies[-1] if latencies else 0
+            }
+
+
+# Pool size and request rate are configurable through the environment
+_fetch_executor = FetchExecutor(
+    max_workers=int(os.environ.get('NSE_SCREENER_FETCH_WORKERS', '8')),
+    rate=float(os.environ.get('NSE_SCREENER_FETCH_RATE', '8')),
+    burst=int(os.environ.get('NSE_SCREENER_FETCH_BURST', '8'))
+)
+
+
+def get_fetch_executor():
+    """Get the process-wide fetch executor"""
+    return _fetch_executor
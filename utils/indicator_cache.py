@@ -0,0 +1,168 @@
+import functools
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(value):
+    """
+    Get a hashable fingerprint of an indicator argument
+
+    Series, DataFrames, arrays and numeric lists are reduced to a digest of
+    their values (and index), so equal content gives equal keys no matter
+    which object holds it. Other values are used as they are.
+
+    Args:
+        value: Indicator argument
+
+    Returns:
+        Hashable fingerprint
+    """
+    if isinstance(value, (pd.Series, pd.DataFrame, np.ndarray, list, tuple)):
+        digest = hashlib.blake2b(digest_size=16)
+        _update_digest(digest, value)
+        return (type(value).__name__, digest.hexdigest())
+    return value
+
+
+def _update_digest(digest, value):
+    """Feed the content of a Series, DataFrame, array or list to a digest"""
+    if isinstance(value, pd.DataFrame):
+        _update_digest(digest, value.index)
+        for column in value.columns:
+            digest.update(repr(column).encode())
+            _update_digest(digest, value[column].to_numpy())
+    elif isinstance(value, pd.Series):
+        _update_digest(digest, value.index)
+        digest.update(repr(value.name).encode())
+        _update_digest(digest, value.to_numpy())
+    elif isinstance(value, pd.DatetimeIndex):
+        digest.update(str(value.tz).encode())
+        digest.update(value.as_unit('ns').asi8.tobytes())
+    elif isinstance(value, pd.Index):
+        _update_digest(digest, value.to_numpy())
+    else:
+        array = np.asarray(value)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        if array.dtype.kind in 'biufcmM':
+            digest.update(np.ascontiguousarray(array).tobytes())
+        else:
+            digest.update(repr(array.tolist()).encode())
+
+
+class IndicatorCache:
+    """
+    Bounded LRU cache of indicator results keyed on input content and parameters
+
+    A rescan of a series without a new bar (same-bar rescans, off-hours
+    cycles) then returns the stored result instead of recomputing it.
+    """
+
+    def __init__(self, max_entries=4096):
+        """
+        Args:
+            max_entries: Number of results kept (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def call(self, fn, key, args, kwargs):
+        """
+        Get a cached result, computing and storing it on a miss
+
+        Args:
+            fn: Indicator function
+            key: Hashable key of the call
+            args: Positional arguments for fn
+            kwargs: Keyword arguments for fn
+
+        Returns:
+            A copy of the result, so callers can modify it freely
+        """
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return _copy(self._results[key])
+            self.misses += 1
+
+        result = fn(*args, **kwargs)
+
+        if self.max_entries > 0:
+            with self._lock:
+                self._results[key] = result
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+
+        return _copy(result)
+
+    def stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            Dict with hits, misses, hit_rate and entries
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._results)
+            }
+
+    def clear(self):
+        """Drop all cached results and reset the counters"""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def memoized(fn):
+    """
+    Decorator caching an indicator function in the process-wide IndicatorCache
+
+    Arguments are bound to the signature with defaults applied, so
+    calculate_atr(data) and calculate_atr(data, 14) share one entry.
+    """
+    signature = inspect.signature(fn)
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (name,) + tuple((parameter, fingerprint(value)) for parameter, value in bound.arguments.items())
+        return _indicator_cache.call(fn, key, args, kwargs)
+
+    return wrapper
+
+
+def _copy(result):
+    """Copy a cached result so the stored one is never modified"""
+    if isinstance(result, (pd.Series, pd.DataFrame, np.ndarray)):
+        return result.copy()
+    if isinstance(result, dict):
+        return {key: _copy(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return list(result)
+    return result
+
+
+# Cache size is configurable through the environment
+_indicator_cache = IndicatorCache(max_entries=int(os.environ.get('NSE_SCREENER_INDICATOR_CACHE', '4096')))
+
+
+def get_indicator_cache():
+    """Get the process-wide indicator cache"""
+    return _indicator_cache
@@ -0,0 +1,159 @@
+import pytz
+import pandas as pd
+from datetime import datetime, timedelta, time as dt_time
+
+# IST timezone and NSE regular session
+IST = pytz.timezone('Asia/Kolkata')
+SESSION_OPEN = dt_time(9, 15)
+SESSION_CLOSE = dt_time(15, 30)
+
+
+def get_ist_time():
+    """Get current time in IST"""
+    return datetime.now(IST)
+
+
+def interval_minutes(interval):
+    """
+    Convert an interval string to its length in minutes
+
+    Args:
+        interval: Interval string ('15m', '1h', '4h', '1d', ...)
+
+    Returns:
+        Length in minutes, or None for daily and longer intervals
+    """
+    if interval.endswith('m'):
+        return int(interval[:-1])
+    if interval.endswith('h'):
+        return int(interval[:-1]) * 60
+    return None
+
+
+def session_bounds(day):
+    """
+    Get session open and close for a calendar day
+
+    Args:
+        day: date object
+
+    Returns:
+        Tuple of (open, close) as tz-aware IST datetimes
+    """
+    session_open = IST.localize(datetime.combine(day, SESSION_OPEN))
+    session_close = IST.localize(datetime.combine(day, SESSION_CLOSE))
+    return session_open, session_close
+
+
+def is_trading_day(day):
+    """Check if a calendar day is a weekday (exchange holidays are not tracked)"""
+    return day.weekday() < 5
+
+
+def session_bar_closes(day, interval):
+    """
+    Get the close times of every bar of an interval in one session
+
+    Bars are anchored at the session open; the last bar of the session
+    is cut short at the session close.
+
+    Args:
+        day: date object
+        interval: Interval string ('15m', '1h', '4h', '1d')
+
+    Returns:
+        List of tz-aware IST datetimes
+    """
+    session_open, session_close = session_bounds(day)
+    minutes = interval_minutes(interval)
+
+    if minutes is None:
+        return [session_close]
+
+    closes = []
+    bar_close = session_open + timedelta(minutes=minutes)
+    while bar_close < session_close:
+        closes.append(bar_close)
+        bar_close += timedelta(minutes=minutes)
+    closes.append(session_close)
+
+    return closes
+
+
+def next_bar_close(interval, now=None):
+    """
+    Get the next bar close at or after a point in time
+
+    Args:
+        interval: Interval string ('15m', '1h', '4h', '1d')
+        now: tz-aware datetime (defaults to current IST time)
+
+    Returns:
+        tz-aware IST datetime of the next bar close
+    """
+    now = (now or get_ist_time()).astimezone(IST)
+    day = now.date()
+
+    # Look ahead far enough to skip a weekend
+    for _ in range(7):
+        if is_trading_day(day):
+            for bar_close in session_bar_closes(day, interval):
+                if bar_close > now:
+                    return bar_close
+        day += timedelta(days=1)
+
+    return now
+
+
+def previous_bar_close(interval, now=None):
+    """
+    Get the most recent bar close at or before a point in time
+
+    Args:
+        interval: Interval string ('15m', '1h', '4h', '1d')
+        now: tz-aware datetime (defaults to current IST time)
+
+    Returns:
+        tz-aware IST datetime of the last bar close, or None if there was
+        none in the past week
+    """
+    now = (now or get_ist_time()).astimezone(IST)
+    day = now.date()
+
+    # Look back far enough to skip a weekend
+    for _ in range(7):
+        if is_trading_day(day):
+            for bar_close in reversed(session_bar_closes(day, interval)):
+                if bar_close <= now:
+                    return bar_close
+        day -= timedelta(days=1)
+
+    return None
+
+
+def period_start(period, now=None):
+    """
+    Get the first calendar day covered by a period string
+
+    Args:
+        period: Data period ('60d', '3mo', '1y', ...)
+        now: tz-aware Timestamp the period ends at (defaults to current IST time)
+
+    Returns:
+        tz-aware IST Timestamp at midnight, or None for open-ended periods
+    """
+    today = pd.Timestamp(now if now is not None else get_ist_time()).tz_convert(IST).normalize()
+
+    try:
+        if period.endswith('mo'):
+            return today - pd.DateOffset(months=int(period[:-2]))
+        if period.endswith('wk'):
+            return today - pd.DateOffset(weeks=int(period[:-2]))
+        if period.endswith('d'):
+            return today - pd.DateOffset(days=int(period[:-1]))
+        if period.endswith('y') and period != 'ytd':
+            return today - pd.DateOffset(years=int(period[:-1]))
+    except ValueError:
+        pass
+
+    return None
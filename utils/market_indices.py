@@ -1,13 +1,18 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import os
+import threading
 import time
+from utils.fetch_executor import get_fetch_executor
+from utils.providers import get_provider
 
 class MarketIndices:
     """Market indices data fetching and analysis"""
     
-    def __init__(self):
+    def __init__(self, provider=None):
+        self.provider = provider or get_provider()
+        self.fetch_executor = get_fetch_executor()
         self.indices = {
             "NIFTY": "^NSEI",
             "BANKNIFTY": "^NSEBANK", 
@@ -41,42 +46,17 @@ class MarketIndices:
         try:
             indices_data = []
             
-            for name, symbol in self.indices.items():
-                try:
-                    # Fetch ticker data
-                    ticker = yf.Ticker(symbol)
-                    
-                    # Get recent data (last 2 days to calculate change)
-                    data = ticker.history(period="2d", interval="1d")
-                    
-                    if not data.empty and len(data) >= 1:
-                        current_price = data['Close'].iloc[-1]
-                        
-                        # Calculate change
-                        if len(data) >= 2:
-                            prev_close = data['Close'].iloc[-2]
-                        else:
-                            prev_close = current_price
-                        
-                        change = current_price - prev_close
-                        change_percent = (change / prev_close) * 100 if prev_close != 0 else 0
-                        
-                        indices_data.append({
-                            'Name': name,
-                            'Symbol': symbol,
-                            'Price': current_price,
-                            'Change': change,
-                            'Change%': change_percent,
-                            'Volume': data['Volume'].iloc[-1] if 'Volume' in data else 0,
-                            'Timestamp': datetime.now()
-                        })
-                    
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    print(f"Error fetching {name}: {e}")
-                    continue
+            # Fetch all indices concurrently under the shared rate limit
+            results = self.fetch_executor.map(
+                lambda item: self._fetch_index_quote(*item),
+                list(self.indices.items())
+            )
+            
+            for (name, symbol), quote, error in results:
+                if error is not None:
+                    print(f"Error fetching {name}: {error}")
+                elif quote is not None:
+                    indices_data.append(quote)
             
             return pd.DataFrame(indices_data)
             
@@ -84,6 +64,44 @@ class MarketIndices:
             print(f"Error fetching market indices: {e}")
             return pd.DataFrame()
     
+    def _fetch_index_quote(self, name, symbol):
+        """
+        Fetch the latest quote for one index
+        
+        Args:
+            name: Display name of the index
+            symbol: Yahoo Finance symbol
+            
+        Returns:
+            Dict with price and change information, or None if no data
+        """
+        # Get recent data (last 2 days to calculate change)
+        data = self.fetch_executor.call(self.provider.history, symbol, interval="1d", period="2d")
+        
+        if data.empty or len(data) < 1:
+            return None
+        
+        current_price = data['Close'].iloc[-1]
+        
+        # Calculate change
+        if len(data) >= 2:
+            prev_close = data['Close'].iloc[-2]
+        else:
+            prev_close = current_price
+        
+        change = current_price - prev_close
+        change_percent = (change / prev_close) * 100 if prev_close != 0 else 0
+        
+        return {
+            'Name': name,
+            'Symbol': symbol,
+            'Price': current_price,
+            'Change': change,
+            'Change%': change_percent,
+            'Volume': data['Volume'].iloc[-1] if 'Volume' in data else 0,
+            'Timestamp': datetime.now()
+        }
+    
     def get_index_data(self, index_name, period="1mo", interval="1d"):
         """
         Get historical data for a specific index
@@ -101,9 +119,7 @@ class MarketIndices:
                 raise ValueError(f"Index {index_name} not found")
             
             symbol = self.indices[index_name]
-            ticker = yf.Ticker(symbol)
-            
-            data = ticker.history(period=period, interval=interval)
+            data = self.fetch_executor.call(self.provider.history, symbol, interval=interval, period=period)
             
             return data
             
@@ -186,8 +202,7 @@ class MarketIndices:
             
             for sector, symbol in sector_indices.items():
                 try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="5d", interval="1d")
+                    data = self.fetch_executor.call(self.provider.history, symbol, interval="1d", period="5d")
                     
                     if not data.empty:
                         current_price = data['Close'].iloc[-1]
@@ -210,8 +225,6 @@ class MarketIndices:
                             'Volume': data['Volume'].iloc[-1] if 'Volume' in data else 0
                         })
                     
-                    time.sleep(0.1)
-                    
                 except Exception as e:
                     print(f"Error fetching {sector}: {e}")
                     continue
@@ -222,15 +235,20 @@ class MarketIndices:
             print(f"Error fetching sector performance: {e}")
             return pd.DataFrame()
     
-    def get_market_sentiment(self):
+    def get_market_sentiment(self, indices_data=None):
         """
         Calculate overall market sentiment based on major indices
         
+        Args:
+            indices_data: DataFrame from get_live_indices (defaults to the
+                          shared indices snapshot)
+        
         Returns:
             Dict with market sentiment analysis
         """
         try:
-            indices_data = self.get_live_indices()
+            if indices_data is None:
+                indices_data = get_indices_snapshot().get()
             
             if indices_data.empty:
                 return None
@@ -269,3 +287,105 @@ class MarketIndices:
         except Exception as e:
             print(f"Error calculating market sentiment: {e}")
             return None
+
+
+class IndicesSnapshot:
+    """
+    Process-wide snapshot of live indices shared by all sessions
+
+    Readers always get the snapshot in memory. Once it is older than ttl
+    seconds, the next read starts one background refresh and keeps
+    returning the previous snapshot until the refresh completes.
+    """
+
+    def __init__(self, fetch_fn, ttl=30.0):
+        """
+        Args:
+            fetch_fn: Callable returning a DataFrame of live indices
+            ttl: Seconds a snapshot stays fresh
+        """
+        self.fetch_fn = fetch_fn
+        self.ttl = ttl
+        self._data = None
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._first_fetch_lock = threading.Lock()
+
+    def get(self):
+        """
+        Get the latest indices snapshot
+
+        The first read fetches synchronously; later reads never wait on
+        the data source.
+
+        Returns:
+            DataFrame with current indices information (shared, do not modify)
+        """
+        with self._lock:
+            data = self._data
+            stale = time.monotonic() - self._fetched_at >= self.ttl
+            start_refresh = stale and not self._refreshing and data is not None
+            if start_refresh:
+                self._refreshing = True
+
+        if data is None:
+            # Concurrent first reads wait for a single fetch
+            with self._first_fetch_lock:
+                if self._data is None:
+                    self.refresh()
+            with self._lock:
+                return self._data if self._data is not None else pd.DataFrame()
+
+        if start_refresh:
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+        return data
+
+    def refresh(self):
+        """Fetch a new snapshot, keeping the previous one if the fetch comes back empty"""
+        data = self.fetch_fn()
+
+        with self._lock:
+            if data is not None and not data.empty:
+                self._data = data
+                self._fetched_at = time.monotonic()
+            elif self._data is None:
+                # Nothing to serve yet; retry on the next read after ttl
+                self._data = data
+                self._fetched_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        """Run one refresh and clear the in-flight flag"""
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error refreshing market indices: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def age(self):
+        """
+        Get the snapshot age
+
+        Returns:
+            Seconds since the snapshot was fetched, or None if never fetched
+        """
+        with self._lock:
+            if self._data is None:
+                return None
+            return time.monotonic() - self._fetched_at
+
+
+# Snapshot lifetime is configurable through the environment; the provider
+# is resolved on every refresh so set_provider() takes effect
+_indices_snapshot = IndicesSnapshot(
+    lambda: MarketIndices().get_live_indices(),
+    ttl=float(os.environ.get('NSE_SCREENER_INDICES_TTL', '30'))
+)
+
+
+def get_indices_snapshot():
+    """Get the process-wide indices snapshot"""
+    return _indices_snapshot
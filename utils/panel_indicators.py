@@ -0,0 +1,318 @@
+import numpy as np
+from utils.rolling_extrema import rolling_max, rolling_min
+
+PANEL_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class BarPanel:
+    """
+    OHLCV bars of many symbols as aligned 2-D arrays (symbols x bars)
+
+    Histories are right-aligned: the last bar of every symbol sits in the
+    last column, and shorter histories are padded with NaN on the left.
+    Indicators computed on the panel therefore match a per-symbol
+    computation, and the current value of every symbol is column -1.
+    """
+
+    __slots__ = ('symbols', 'lengths', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbols, lengths, timestamp, open, high, low, close, volume):
+        self.symbols = symbols
+        self.lengths = lengths
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @classmethod
+    def from_frames(cls, stock_data):
+        """
+        Build a panel from per-symbol DataFrames
+
+        Args:
+            stock_data: Dict with symbol as key and OHLCV DataFrame as value
+
+        Returns:
+            BarPanel (empty frames are skipped)
+        """
+        symbols = [symbol for symbol, data in stock_data.items() if data is not None and not data.empty]
+        lengths = np.array([len(stock_data[symbol]) for symbol in symbols], dtype=np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+
+        timestamp = np.full((len(symbols), width), np.iinfo(np.int64).min, dtype=np.int64)
+        columns = {column: np.full((len(symbols), width), np.nan) for column in PANEL_COLUMNS}
+
+        for row, symbol in enumerate(symbols):
+            data = stock_data[symbol]
+            start = width - len(data)
+            timestamp[row, start:] = data.index.as_unit('ns').asi8
+            for column in PANEL_COLUMNS:
+                columns[column][row, start:] = data[column].to_numpy(dtype=np.float64)
+
+        return cls(symbols, lengths, timestamp,
+                   columns['Open'], columns['High'], columns['Low'], columns['Close'], columns['Volume'])
+
+    def valid(self):
+        """
+        Get the mask of real (non-padding) bars
+
+        Returns:
+            Boolean array of shape (symbols, bars)
+        """
+        return np.arange(self.close.shape[1])[None, :] >= (self.close.shape[1] - self.lengths)[:, None]
+
+    def row(self, symbol, values):
+        """
+        Get one symbol's values without its padding
+
+        Args:
+            symbol: Stock symbol
+            values: Array of shape (symbols, bars) computed from this panel
+
+        Returns:
+            1-D array with one value per bar of the symbol
+        """
+        row = self.symbols.index(symbol)
+        return values[row, values.shape[1] - self.lengths[row]:]
+
+
+class PanelIndicators:
+    """
+    Technical indicators over a BarPanel, one vectorized call per universe
+
+    Every method takes and returns (symbols x bars) arrays and mirrors the
+    pandas definitions used by TechnicalIndicators, so a row of the result
+    equals the per-symbol Series computation. Padding stays NaN.
+    """
+
+    @staticmethod
+    def calculate_ema(values, period):
+        """
+        Calculate Exponential Moving Average (pandas ewm(span=period).mean())
+
+        Recursive over bars but vectorized over symbols. NaN bars after the
+        first value keep decaying the weights and repeat the previous value,
+        as pandas does with ignore_na=False.
+
+        Args:
+            values: 2-D array of prices
+            period: EMA span
+
+        Returns:
+            2-D array with EMA values
+        """
+        # A shard whose fetch returned nothing has no bars to seed from
+        if values.shape[1] == 0:
+            return np.full(values.shape, np.nan)
+
+        decay = 1 - 2 / (period + 1)
+        present = ~np.isnan(values)
+
+        # Column-major copies keep each bar's values contiguous for the loop
+        x = np.asfortranarray(np.where(present, values, 0.0))
+        weights = np.asfortranarray(present, dtype=np.float64)
+        numerator = np.empty_like(x)
+        denominator = np.empty_like(x)
+
+        numerator[:, 0] = x[:, 0]
+        denominator[:, 0] = weights[:, 0]
+        for column in range(1, values.shape[1]):
+            np.multiply(numerator[:, column - 1], decay, out=numerator[:, column])
+            numerator[:, column] += x[:, column]
+            np.multiply(denominator[:, column - 1], decay, out=denominator[:, column])
+            denominator[:, column] += weights[:, column]
+
+        # Bars before a symbol's first value have no weight yet
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(denominator > 0, numerator / denominator, np.nan)
+
+    @staticmethod
+    def calculate_macd(close, fast=12, slow=26, signal=9):
+        """
+        Calculate MACD (Moving Average Convergence Divergence)
+
+        Args:
+            close: 2-D array of close prices
+            fast: Fast EMA period
+            slow: Slow EMA period
+            signal: Signal line EMA period
+
+        Returns:
+            Tuple of 2-D arrays (MACD, Signal, Histogram)
+        """
+        macd_line = PanelIndicators.calculate_ema(close, fast) - PanelIndicators.calculate_ema(close, slow)
+        signal_line = PanelIndicators.calculate_ema(macd_line, signal)
+
+        return macd_line, signal_line, macd_line - signal_line
+
+    @staticmethod
+    def calculate_sma(values, period):
+        """
+        Calculate Simple Moving Average (NaN until a full window is available)
+
+        Args:
+            values: 2-D array
+            period: SMA period
+
+        Returns:
+            2-D array with SMA values
+        """
+        return _rolling_mean(values, period)
+
+    @staticmethod
+    def calculate_atr(high, low, close, period=14):
+        """
+        Calculate Average True Range (rolling mean of True Range)
+
+        Args:
+            high: 2-D array of highs
+            low: 2-D array of lows
+            close: 2-D array of closes
+            period: ATR calculation period
+
+        Returns:
+            2-D array with ATR values
+        """
+        previous_close = _shift(close)
+
+        # The first bar of each symbol only has its high-low range, like pandas' NaN-skipping max
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+        return PanelIndicators.calculate_sma(true_range, period)
+
+    @staticmethod
+    def calculate_rsi(close, period=14):
+        """
+        Calculate Relative Strength Index (RSI) with simple moving averages
+
+        Args:
+            close: 2-D array of close prices
+            period: RSI calculation period
+
+        Returns:
+            2-D array with RSI values
+        """
+        delta = close - _shift(close)
+        present = ~np.isnan(close)
+
+        # The first bar of each symbol counts as no change, as in the pandas version
+        gain = np.where(present, np.where(delta > 0, delta, 0.0), np.nan)
+        loss = np.where(present, np.where(delta < 0, -delta, 0.0), np.nan)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = PanelIndicators.calculate_sma(gain, period) / PanelIndicators.calculate_sma(loss, period)
+            return 100 - (100 / (1 + rs))
+
+    @staticmethod
+    def calculate_bollinger_bands(close, period=20, std_dev=2):
+        """
+        Calculate Bollinger Bands (sample standard deviation, like pandas)
+
+        Args:
+            close: 2-D array of close prices
+            period: Moving average period
+            std_dev: Standard deviation multiplier
+
+        Returns:
+            Tuple of 2-D arrays (Upper, Middle, Lower)
+        """
+        middle = _rolling_mean(close, period)
+        std = _rolling_std(close, period)
+
+        return middle + std * std_dev, middle, middle - std * std_dev
+
+    @staticmethod
+    def calculate_stochastic(high, low, close, k_period=14, d_period=3):
+        """
+        Calculate Stochastic Oscillator
+
+        Args:
+            high: 2-D array of highs
+            low: 2-D array of lows
+            close: 2-D array of closes
+            k_period: %K calculation period
+            d_period: %D smoothing period
+
+        Returns:
+            Tuple of 2-D arrays (%K, %D)
+        """
+        low_min = rolling_min(low, k_period)
+        high_max = rolling_max(high, k_period)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k_percent = 100 * ((close - low_min) / (high_max - low_min))
+
+        return k_percent, PanelIndicators.calculate_sma(k_percent, d_period)
+
+
+def _shift(values):
+    """Shift a 2-D array one bar to the right, filling the first column with NaN"""
+    shifted = np.full(values.shape, np.nan)
+    shifted[:, 1:] = values[:, :-1]
+    return shifted
+
+
+def _rolling_sums(values, period, power=1):
+    """
+    Trailing sums of values**power along the bar axis from running sums
+
+    Returns:
+        Tuple of (sums, full) for every window end from bar period-1 on,
+        where full marks windows without NaN
+    """
+    present = ~np.isnan(values)
+    sums = np.cumsum(np.where(present, values, 0.0) ** power, axis=1)
+    counts = np.cumsum(present, axis=1, dtype=np.int32)
+
+    window_sums = sums[:, period - 1:].copy()
+    window_sums[:, 1:] -= sums[:, :-period]
+    window_counts = counts[:, period - 1:].copy()
+    window_counts[:, 1:] -= counts[:, :-period]
+
+    return window_sums, window_counts == period
+
+
+def _rolling_mean(values, period):
+    """
+    Trailing mean along the bar axis, NaN until a full window of values
+
+    Uses running sums, so the cost is linear in the number of bars
+    regardless of period.
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] < period:
+        return result
+
+    window_sums, full = _rolling_sums(values, period)
+    result[:, period - 1:] = np.where(full, window_sums / period, np.nan)
+
+    return result
+
+
+def _rolling_std(values, period, ddof=1):
+    """
+    Trailing standard deviation along the bar axis from running sums
+
+    Values are centred on each symbol's mean first, which keeps the
+    running sums of squares small enough for the subtraction to stay exact
+    to ~1e-12 relative.
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] < period:
+        return result
+
+    with np.errstate(invalid='ignore'):
+        centred = values - np.nanmean(values, axis=1, keepdims=True)
+
+    sums, full = _rolling_sums(centred, period)
+    squares, _ = _rolling_sums(centred, period, power=2)
+
+    variance = np.maximum(squares - sums * sums / period, 0.0) / (period - ddof)
+    result[:, period - 1:] = np.where(full, np.sqrt(variance), np.nan)
+
+    return result
@@ -0,0 +1,258 @@
+import threading
+import numpy as np
+from utils.indicator_cache import fingerprint
+from utils.rolling_extrema import rolling_max, rolling_min
+
+
+class SortedPrices:
+    """
+    A price column sorted once, answering tolerance bands by binary search
+
+    A bar touches a level when abs(price - level) / level <= tolerance.
+    For a positive level that test only grows with the distance from the
+    level, so the touching prices form one contiguous run of the sorted
+    column. Its ends are found by bisecting with that exact test (rather
+    than with level * (1 +- tolerance), which can round differently), so
+    the touches are exactly those of a scan over every bar.
+    """
+
+    __slots__ = ('prices', 'order', 'sorted')
+
+    def __init__(self, prices):
+        """
+        Args:
+            prices: 1-D array of prices in bar order
+        """
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.order = np.argsort(self.prices, kind='stable')
+        self.sorted = self.prices[self.order]
+
+    def __len__(self):
+        return len(self.prices)
+
+    def bands(self, levels, tolerance):
+        """
+        Find the touching prices of many levels at once
+
+        Args:
+            levels: 1-D array of positive level prices
+            tolerance: Relative tolerance of a touch
+
+        Returns:
+            Tuple of (start, end) arrays: the touches of levels[i] are
+            sorted[start[i]:end[i]]
+        """
+        levels = np.asarray(levels, dtype=np.float64)
+        middle = np.searchsorted(self.sorted, levels)
+
+        # Below the level the test turns true once; above it, false once
+        start = self._bisect(levels, tolerance, np.zeros_like(middle), middle, touching=True)
+        end = self._bisect(levels, tolerance, middle, np.full_like(middle, len(self.sorted)), touching=False)
+
+        return start, end
+
+    def touches(self, start, end):
+        """
+        Get the bar positions of a band's touches in bar order
+
+        Args:
+            start: Band start returned by bands()
+            end: Band end returned by bands()
+
+        Returns:
+            Sorted 1-D array of bar positions
+        """
+        return np.sort(self.order[start:end])
+
+    def _bisect(self, levels, tolerance, low, high, touching):
+        """Find, per level, the first position in [low, high] where the touch test equals touching"""
+        low, high = low.copy(), high.copy()
+        active = low < high
+
+        while active.any():
+            middle = (low + high) // 2
+            with np.errstate(invalid='ignore', divide='ignore'):
+                hit = (np.abs(self.sorted[np.minimum(middle, len(self.sorted) - 1)] - levels) / levels <= tolerance) == touching
+
+            high = np.where(active & hit, middle, high)
+            low = np.where(active & ~hit, middle + 1, low)
+            active = low < high
+
+        return low
+
+
+def touch_levels(prices, candidates, tolerance, min_touches, index=None):
+    """
+    Turn candidate prices into levels with their touch statistics
+
+    Same result as counting, for every candidate, the bars whose price is
+    within tolerance in a loop over the whole column, in O(log n) per
+    candidate plus the touches of confirmed levels. Candidates with the
+    same price are evaluated once.
+
+    Args:
+        prices: 1-D array of prices in bar order (e.g. the High column)
+        candidates: Candidate level prices (e.g. peak highs), in order
+        tolerance: Relative tolerance of a touch
+        min_touches: Minimum number of touches to confirm a level
+        index: SortedPrices of prices, if already built
+
+    Returns:
+        List of dicts (level, touches, last_touch, first_touch, strength)
+        for the confirmed candidates, in candidate order
+    """
+    index = index if index is not None else SortedPrices(prices)
+    clusters, members = np.unique(np.asarray(candidates, dtype=np.float64), return_inverse=True)
+
+    return _confirmed(_touch_stats(index, clusters, tolerance), members, min_touches)
+
+
+def _touch_stats(index, clusters, tolerance):
+    """Get the touch statistics of every cluster price (None for untouched ones)"""
+    bars = len(index)
+    start, end = index.bands(clusters, tolerance)
+    stats = []
+
+    for band_start, band_end in zip(start.tolist(), end.tolist()):
+        touch_count = band_end - band_start
+        if touch_count == 0:
+            stats.append(None)
+            continue
+
+        touch_indices = index.touches(band_start, band_end)
+        last_touch_idx = int(touch_indices[-1])
+
+        stats.append({
+            # Mean over the touches in bar order, like the per-bar loop
+            'level': np.mean(index.prices[touch_indices]),
+            'touches': touch_count,
+            'last_touch': last_touch_idx,
+            'first_touch': int(touch_indices[0]),
+            'strength': touch_count * (1 + (bars - last_touch_idx) / bars)
+        })
+
+    return stats
+
+
+def _confirmed(stats, members, min_touches):
+    """Expand cluster statistics back to one level dict per confirmed candidate"""
+    return [dict(stats[member]) for member in members.tolist()
+            if stats[member] is not None and stats[member]['touches'] >= min_touches]
+
+
+class LevelIndex:
+    """
+    Price-level index of one series: peak and trough candidates plus sorted
+    High and Low columns
+
+    Candidates are the bars equal to the centered rolling max (peaks) or min
+    (troughs), clustered by price. Touch statistics are computed once per
+    tolerance and kept, so every scanner querying the same series, with
+    any tolerance and min_touches, shares one build.
+    """
+
+    def __init__(self, data, window=20):
+        """
+        Args:
+            data: OHLCV DataFrame
+            window: Rolling window for peak and trough detection
+        """
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+
+        self.window = window
+        self.highs = SortedPrices(high)
+        self.lows = SortedPrices(low)
+        self.peaks = np.unique(high[high == rolling_max(high, window, center=True)], return_inverse=True)
+        self.troughs = np.unique(low[low == rolling_min(low, window, center=True)], return_inverse=True)
+        self._stats = {}
+
+    def resistance(self, tolerance, min_touches):
+        """
+        Get resistance levels confirmed by peaks
+
+        Args:
+            tolerance: Relative tolerance of a touch
+            min_touches: Minimum number of touches to confirm a level
+
+        Returns:
+            List of level dicts (level, touches, last_touch, first_touch,
+            strength), one per confirmed peak in bar order
+        """
+        return self._levels('resistance', self.highs, self.peaks, tolerance, min_touches)
+
+    def support(self, tolerance, min_touches):
+        """
+        Get support levels confirmed by troughs
+
+        Args:
+            tolerance: Relative tolerance of a touch
+            min_touches: Minimum number of touches to confirm a level
+
+        Returns:
+            List of level dicts, one per confirmed trough in bar order
+        """
+        return self._levels('support', self.lows, self.troughs, tolerance, min_touches)
+
+    def _levels(self, side, index, candidates, tolerance, min_touches):
+        clusters, members = candidates
+        stats = self._stats.get((side, tolerance))
+
+        if stats is None:
+            stats = _touch_stats(index, clusters, tolerance)
+            self._stats[(side, tolerance)] = stats
+
+        return _confirmed(stats, members, min_touches)
+
+
+class LevelIndexRegistry:
+    """Latest LevelIndex per (symbol, interval), rebuilt when the bars change"""
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol, interval, data, window=20):
+        """
+        Get the level index of a series, building it on first use or after a new bar
+
+        Args:
+            symbol: Stock symbol (None builds an index that is not kept)
+            interval: Data interval
+            data: OHLCV DataFrame
+            window: Rolling window for peak and trough detection
+
+        Returns:
+            LevelIndex
+        """
+        if symbol is None:
+            return LevelIndex(data, window)
+
+        key = (symbol, interval, window)
+        version = fingerprint(data[['High', 'Low']])
+
+        with self._lock:
+            entry = self._indexes.get(key)
+
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        index = LevelIndex(data, window)
+
+        with self._lock:
+            self._indexes[key] = (version, index)
+
+        return index
+
+    def clear(self):
+        """Drop all level indexes"""
+        with self._lock:
+            self._indexes.clear()
+
+
+_level_indexes = LevelIndexRegistry()
+
+
+def get_level_indexes():
+    """Get the process-wide level index registry"""
+    return _level_indexes
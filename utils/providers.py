@@ -0,0 +1,305 @@
+import os
+import time
+import zlib
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from utils.disk_cache import DiskBarCache
+from utils.market_calendar import IST, get_ist_time, interval_minutes, period_start, session_bar_closes
+
+
+class MarketDataProvider:
+    """Interface for market data sources used by DataFetcher, MarketIndices and the scanners"""
+
+    # Name of the upstream host, used to key circuit breakers
+    host = 'market-data'
+
+    def now(self):
+        """Get the provider's current time as a tz-aware IST Timestamp"""
+        return pd.Timestamp(get_ist_time())
+
+    def history(self, symbol, interval="1d", period=None, start=None):
+        """
+        Get OHLCV bars for one symbol
+
+        Args:
+            symbol: Symbol (e.g., 'RELIANCE.NS', '^NSEI')
+            interval: Bar interval
+            period: Data period (used when start is None)
+            start: Earliest bar timestamp to return
+
+        Returns:
+            DataFrame with OHLCV columns and a tz-aware DatetimeIndex
+        """
+        raise NotImplementedError
+
+    def download(self, symbols, interval="1d", period=None, start=None):
+        """
+        Get OHLCV bars for several symbols in one request
+
+        Args:
+            symbols: List of symbols
+            interval: Bar interval
+            period: Data period (used when start is None)
+            start: Earliest bar timestamp to return
+
+        Returns:
+            Dict with symbol as key and DataFrame as value (missing symbols omitted)
+        """
+        return {symbol: self.history(symbol, interval, period, start) for symbol in symbols}
+
+    def info(self, symbol):
+        """
+        Get quote metadata for one symbol
+
+        Args:
+            symbol: Symbol
+
+        Returns:
+            Dict in the shape of yfinance Ticker.info
+        """
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live market data from Yahoo Finance"""
+
+    host = 'finance.yahoo.com'
+
+    def history(self, symbol, interval="1d", period=None, start=None):
+        ticker = yf.Ticker(symbol)
+
+        if start is not None:
+            return ticker.history(start=start, interval=interval)
+
+        return ticker.history(period=period, interval=interval)
+
+    def download(self, symbols, interval="1d", period=None, start=None):
+        window = {'start': start} if start is not None else {'period': period}
+
+        # One request at a time per call, so FetchExecutor's worker count
+        # bounds the requests in flight
+        combined = yf.download(
+            symbols,
+            interval=interval,
+            group_by='ticker',
+            auto_adjust=True,
+            progress=False,
+            threads=False,
+            **window
+        )
+
+        stock_data = {}
+
+        if combined is None or combined.empty:
+            return stock_data
+
+        for symbol in symbols:
+            if isinstance(combined.columns, pd.MultiIndex):
+                if symbol not in combined.columns.get_level_values(0):
+                    continue
+                raw = combined[symbol]
+            elif len(symbols) == 1:
+                raw = combined
+            else:
+                continue
+
+            # The combined frame is indexed on the union of all timestamps
+            stock_data[symbol] = raw.dropna(how='all')
+
+        return stock_data
+
+    def info(self, symbol):
+        return yf.Ticker(symbol).info
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Offline market data served from local files
+
+    Looks up '<symbol>__<interval>.npz' (the DiskBarCache format, so a copy
+    of the live cache directory can be replayed as-is) and then
+    '<symbol>__<interval>.csv' in data_dir. With synthetic=True, symbols
+    without a file get a deterministic random walk instead.
+    """
+
+    host = 'replay'
+
+    def __init__(self, data_dir, latency=0.0, now=None, synthetic=False):
+        """
+        Args:
+            data_dir: Directory holding recorded series (only ever read)
+            latency: Seconds to sleep per request, to mimic network round trips
+            now: Replay clock as a tz-aware Timestamp (defaults to wall clock);
+                 bars after it are hidden
+            synthetic: Generate bars for symbols without a recorded file
+        """
+        self.data_dir = data_dir
+        self.latency = latency
+        self.synthetic = synthetic
+        self._now = pd.Timestamp(now).tz_convert(IST) if now is not None else None
+        self._files = DiskBarCache(data_dir, read_only=True)
+        self._series = {}
+
+    def now(self):
+        return self._now if self._now is not None else super().now()
+
+    def history(self, symbol, interval="1d", period=None, start=None):
+        if self.latency:
+            time.sleep(self.latency)
+
+        return self._window(symbol, interval, period, start)
+
+    def download(self, symbols, interval="1d", period=None, start=None):
+        if self.latency:
+            time.sleep(self.latency)
+
+        stock_data = {}
+        for symbol in symbols:
+            data = self._window(symbol, interval, period, start)
+            if not data.empty:
+                stock_data[symbol] = data
+
+        return stock_data
+
+    def info(self, symbol):
+        if self.latency:
+            time.sleep(self.latency)
+
+        daily = self._window(symbol, "1d", "5d", None)
+        if daily.empty:
+            return {}
+
+        return {
+            'currentPrice': float(daily['Close'].iloc[-1]),
+            'previousClose': float(daily['Close'].iloc[-2]) if len(daily) >= 2 else float(daily['Close'].iloc[-1]),
+            'volume': int(daily['Volume'].iloc[-1]),
+            'marketCap': 0
+        }
+
+    def _window(self, symbol, interval, period, start):
+        """Slice a series to the replay clock and the requested window"""
+        data = self._load(symbol, interval)
+        now = self.now()
+
+        data = data[data.index <= now]
+
+        if start is not None:
+            return data[data.index >= start]
+
+        first_day = period_start(period, now) if period else None
+        if first_day is not None:
+            return data[data.index >= first_day]
+
+        return data
+
+    def _load(self, symbol, interval):
+        """Load (and memoize) the full series for a symbol"""
+        key = (symbol, interval)
+
+        if key not in self._series:
+            cached = self._files.load(symbol, interval)
+
+            if cached is not None:
+                data = cached[0]
+            else:
+                data = self._load_csv(symbol, interval)
+
+            if data is None and self.synthetic:
+                data = synthetic_bars(symbol, interval, self.now())
+
+            self._series[key] = data if data is not None else pd.DataFrame(
+                columns=['Open', 'High', 'Low', 'Close', 'Volume'],
+                index=pd.DatetimeIndex([], tz=IST)
+            )
+
+        return self._series[key]
+
+    def _load_csv(self, symbol, interval):
+        """Load '<symbol>__<interval>.csv' with a datetime first column"""
+        path = self._files._path(symbol, interval)[:-4] + '.csv'
+
+        if not os.path.exists(path):
+            return None
+
+        data = pd.read_csv(path, index_col=0)
+        index = pd.to_datetime(data.index, utc=True).tz_convert(IST)
+        data.index = index
+
+        return data[['Open', 'High', 'Low', 'Close', 'Volume']].sort_index()
+
+
+def synthetic_bars(symbol, interval, end, days=400):
+    """
+    Generate a deterministic random-walk OHLCV series on the NSE session calendar
+
+    Args:
+        symbol: Symbol (seeds the generator, so each symbol gets its own path)
+        interval: Bar interval ('15m', '1h', '1d', ...)
+        end: tz-aware Timestamp of the last bar
+        days: Calendar days of history
+
+    Returns:
+        DataFrame with OHLCV columns indexed by bar start in IST
+    """
+    end = pd.Timestamp(end).tz_convert(IST)
+    minutes = interval_minutes(interval)
+    stamps = []
+
+    for day in pd.date_range(end.normalize() - pd.Timedelta(days=days), end.normalize(), freq='D'):
+        if day.weekday() >= 5:
+            continue
+
+        if minutes is None:
+            stamps.append(day)
+            continue
+
+        bar_start = day + pd.Timedelta(hours=9, minutes=15)
+        for bar_close in session_bar_closes(day.date(), interval):
+            stamps.append(bar_start)
+            bar_start = pd.Timestamp(bar_close)
+
+    index = pd.DatetimeIndex(stamps).tz_convert(IST) if stamps else pd.DatetimeIndex([], tz=IST)
+    index = index[index <= end]
+
+    rng = np.random.default_rng(zlib.crc32(f"{symbol}|{interval}".encode()))
+    n = len(index)
+    start_price = 100 + (zlib.crc32(symbol.encode()) % 3000)
+
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.003, n)) * close
+
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.integers(10_000, 1_000_000, n).astype(np.float64)
+    }, index=index)
+
+
+def _provider_from_env():
+    """Build the provider selected by NSE_SCREENER_PROVIDER ('yfinance' or 'replay')"""
+    if os.environ.get('NSE_SCREENER_PROVIDER', 'yfinance') == 'replay':
+        return ReplayProvider(
+            os.environ.get('NSE_SCREENER_REPLAY_DIR', os.path.join('.cache', 'replay')),
+            latency=float(os.environ.get('NSE_SCREENER_REPLAY_LATENCY', '0')),
+            synthetic=os.environ.get('NSE_SCREENER_REPLAY_SYNTHETIC', '1') == '1'
+        )
+
+    return YFinanceProvider()
+
+
+_provider = _provider_from_env()
+
+
+def get_provider():
+    """Get the process-wide market data provider"""
+    return _provider
+
+
+def set_provider(provider):
+    """Replace the process-wide market data provider (e.g. with a ReplayProvider)"""
+    global _provider
+    _provider = provider
@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+import pandas as pd
+
+QUOTE_COLUMNS = ['price', 'previous_close', 'change', 'change_percent', 'volume', 'as_of']
+
+
+def quotes_from_bars(stock_data):
+    """
+    Build quote rows from recent daily bars
+
+    The last bar (today's, while the session is open) gives the price and
+    volume, and the bar before it the previous close.
+
+    Args:
+        stock_data: Dict with symbol as key and daily OHLCV DataFrame as value
+
+    Returns:
+        DataFrame indexed by symbol with QUOTE_COLUMNS
+    """
+    rows = {}
+
+    for symbol, data in stock_data.items():
+        data = data.dropna(subset=['Close']) if data is not None else None
+        if data is None or data.empty:
+            continue
+
+        price = float(data['Close'].iloc[-1])
+        previous_close = float(data['Close'].iloc[-2]) if len(data) >= 2 else price
+        rows[symbol] = (
+            price,
+            previous_close,
+            price - previous_close,
+            (price - previous_close) / previous_close * 100 if previous_close else 0.0,
+            float(data['Volume'].iloc[-1]) if 'Volume' in data else 0.0,
+            data.index[-1]
+        )
+
+    quotes = pd.DataFrame.from_dict(rows, orient='index', columns=QUOTE_COLUMNS)
+    quotes.index.name = 'symbol'
+    return quotes
+
+
+class QuoteCache:
+    """Process-wide latest-quote snapshot with a short per-symbol TTL"""
+
+    def __init__(self, ttl=15.0):
+        """
+        Args:
+            ttl: Seconds a quote stays fresh
+        """
+        self.ttl = ttl
+        self._quotes = pd.DataFrame(columns=QUOTE_COLUMNS)
+        self._fetched_at = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbols, fetch_fn):
+        """
+        Get quotes for symbols, fetching only those missing or expired
+
+        Args:
+            symbols: List of symbols
+            fetch_fn: Callable taking a list of symbols and returning a
+                      DataFrame like quotes_from_bars
+
+        Returns:
+            DataFrame indexed by symbol with QUOTE_COLUMNS, in the order of
+            symbols (symbols without a quote are omitted)
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            stale = [symbol for symbol in symbols
+                     if now - self._fetched_at.get(symbol, float('-inf')) >= self.ttl]
+
+        if stale:
+            fresh = fetch_fn(stale)
+
+            with self._lock:
+                if not fresh.empty:
+                    kept = self._quotes[~self._quotes.index.isin(fresh.index)]
+                    self._quotes = fresh if kept.empty else pd.concat([kept, fresh])
+                    fetched_at = time.monotonic()
+                    for symbol in fresh.index:
+                        self._fetched_at[symbol] = fetched_at
+
+        with self._lock:
+            return self._quotes.reindex([symbol for symbol in symbols if symbol in self._quotes.index])
+
+    def clear(self):
+        """Drop all cached quotes"""
+        with self._lock:
+            self._quotes = pd.DataFrame(columns=QUOTE_COLUMNS)
+            self._fetched_at.clear()
+
+
+# Quote lifetime is configurable through the environment
+_quote_cache = QuoteCache(ttl=float(os.environ.get('NSE_SCREENER_QUOTE_TTL', '15')))
+
+
+def get_quote_cache():
+    """Get the process-wide quote cache"""
+    return _quote_cache
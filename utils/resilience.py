@@ -0,0 +1,167 @@
+import os
+import random
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the host's circuit is open"""
+
+
+class NoDataError(Exception):
+    """
+    Raised by a request the host answered without data (e.g. an unknown symbol)
+
+    The host is reachable, so ResilientCaller neither retries it nor counts
+    it against the circuit breaker.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+
+    Opens after failure_threshold consecutive failures and refuses calls
+    for reset_timeout seconds. It then lets one trial call through
+    (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether a call may go through
+
+        Returns:
+            Boolean indicating if the call is allowed
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return True
+
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = 'half-open'
+                self._trial_in_flight = False
+
+            if self.state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold"""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+
+            if self.state == 'half-open' or self._failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+
+class ResilientCaller:
+    """Retries calls with jittered exponential backoff behind per-host circuit breakers"""
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0,
+                 failure_threshold=5, reset_timeout=60.0):
+        """
+        Args:
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff before the first retry in seconds
+            max_delay: Upper bound on a single backoff in seconds
+            failure_threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds a circuit stays open before a trial call
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host):
+        """Get (or create) the circuit breaker for a host"""
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def call(self, host, fn, *args, **kwargs):
+        """
+        Call fn with retries, refusing fast while the host's circuit is open
+
+        Args:
+            host: Name of the host fn talks to
+            fn: Callable that performs the request
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            Result of fn
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            NoDataError: If fn raised it (not retried)
+            Exception: The last error once attempts are exhausted
+        """
+        breaker = self.breaker(host)
+
+        for attempt in range(self.max_attempts):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {host}")
+
+            try:
+                result = fn(*args, **kwargs)
+            except NoDataError:
+                breaker.record_success()
+                raise
+            except Exception:
+                breaker.record_failure()
+                if attempt == self.max_attempts - 1:
+                    raise
+
+                # Full jitter: sleep a random fraction of the exponential backoff
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                continue
+
+            breaker.record_success()
+            return result
+
+    def states(self):
+        """
+        Get circuit states
+
+        Returns:
+            Dict with host as key and state ('closed', 'open', 'half-open') as value
+        """
+        with self._lock:
+            return {host: breaker.state for host, breaker in self._breakers.items()}
+
+
+# Retry and breaker settings are configurable through the environment
+_resilient_caller = ResilientCaller(
+    max_attempts=int(os.environ.get('NSE_SCREENER_RETRY_ATTEMPTS', '3')),
+    base_delay=float(os.environ.get('NSE_SCREENER_RETRY_DELAY', '0.5')),
+    failure_threshold=int(os.environ.get('NSE_SCREENER_BREAKER_THRESHOLD', '5')),
+    reset_timeout=float(os.environ.get('NSE_SCREENER_BREAKER_RESET', '60'))
+)
+
+
+def get_resilient_caller():
+    """Get the process-wide resilient caller"""
+    return _resilient_caller
@@ -0,0 +1,98 @@
+import numpy as np
+
+
+def rolling_max(values, window, center=False, return_positions=False):
+    """
+    Rolling maximum along the last axis in O(n), independent of window
+
+    Same windows and NaN handling as pandas rolling(window, center=center).max()
+    with the default min_periods: windows that are cut off at either end of
+    the series or contain NaN give NaN.
+
+    Args:
+        values: 1-D array, or 2-D array with one series per row
+        window: Window length in bars
+        center: Center the window on each bar instead of ending it there
+        return_positions: Also return the position of each window's maximum
+
+    Returns:
+        Array of maxima with the shape of values, or a tuple of (maxima,
+        positions) where positions are indices along the last axis of the
+        first bar holding the maximum (-1 where the maximum is NaN)
+    """
+    return _rolling_extremum(values, window, center, return_positions, np.maximum, np.greater)
+
+
+def rolling_min(values, window, center=False, return_positions=False):
+    """
+    Rolling minimum along the last axis in O(n), independent of window
+
+    See rolling_max; positions are those of each window's minimum.
+    """
+    return _rolling_extremum(values, window, center, return_positions, np.minimum, np.less)
+
+
+def _rolling_extremum(values, window, center, return_positions, extremum, better):
+    """
+    van Herk/Gil-Werman rolling extremum
+
+    The series is cut into blocks of window bars. A window then spans at
+    most two blocks, so its extremum is that of the suffix of the first
+    block and the prefix of the second, both precomputed with one
+    accumulate per direction.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    one_series = values.ndim == 1
+    values = np.atleast_2d(values)
+
+    rows, n = values.shape
+    result = np.full((rows, n), np.nan)
+    positions = np.full((rows, n), -1, dtype=np.int64)
+
+    if window >= 1 and n >= window:
+        blocks = -(-n // window)
+        padded = np.full((rows, blocks * window), np.nan)
+        padded[:, :n] = values
+        padded = padded.reshape(rows, blocks, window)
+
+        # Running extremum from each block's start (prefix) and end (suffix);
+        # NaN propagates through both, so windows holding NaN become NaN
+        prefix = extremum.accumulate(padded, axis=2)
+        suffix = extremum.accumulate(padded[:, :, ::-1], axis=2)[:, :, ::-1]
+
+        # Window [start, end] for every end from window - 1 on
+        starts = np.arange(n - window + 1)
+        ends = starts + window - 1
+        prefix = prefix.reshape(rows, -1)
+        suffix = suffix.reshape(rows, -1)
+        trailing = extremum(suffix[:, starts], prefix[:, ends])
+
+        # pandas centers a window on bar i as [i - window // 2, i + (window - 1) // 2]
+        offset = (window - 1) // 2 if center else 0
+        result[:, window - 1 - offset:n - offset] = trailing
+
+        if return_positions:
+            bar = np.broadcast_to(np.arange(blocks * window).reshape(1, blocks, window), padded.shape)
+
+            # First bar of the prefix extremum: the last bar that improved on it
+            improves = np.ones(padded.shape, dtype=bool)
+            improves[:, :, 1:] = better(padded[:, :, 1:], prefix.reshape(padded.shape)[:, :, :-1])
+            prefix_position = np.maximum.accumulate(np.where(improves, bar, 0), axis=2).reshape(rows, -1)
+
+            # First bar of the suffix extremum: scanning leftwards, ties move it left
+            suffix_blocks = suffix.reshape(padded.shape)
+            improves = np.ones(padded.shape, dtype=bool)
+            improves[:, :, :-1] = ~better(suffix_blocks[:, :, 1:], padded[:, :, :-1])
+            suffix_position = np.minimum.accumulate(
+                np.where(improves, bar, blocks * window)[:, :, ::-1], axis=2
+            )[:, :, ::-1].reshape(rows, -1)
+
+            trailing_positions = np.where(
+                ~better(prefix[:, ends], suffix[:, starts]), suffix_position[:, starts], prefix_position[:, ends]
+            )
+            positions[:, window - 1 - offset:n - offset] = np.where(np.isnan(trailing), -1, trailing_positions)
+
+    if one_series:
+        result, positions = result[0], positions[0]
+
+    return (result, positions) if return_positions else result
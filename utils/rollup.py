@@ -0,0 +1,109 @@
+import threading
+import pandas as pd
+from utils.session_bars import aggregate_session_bars, session_bin_labels
+
+# Coarser intervals derived locally from one downloaded base interval
+ROLLUP_BASE = {
+    "4h": "1h",
+    "1d": "1h"
+}
+
+
+def bin_labels(index, interval):
+    """
+    Get the bar each base timestamp belongs to
+
+    Args:
+        index: tz-aware DatetimeIndex of base bars
+        interval: Target interval ('4h', '1d')
+
+    Returns:
+        DatetimeIndex of bar start labels, same length as index
+    """
+    return session_bin_labels(index, interval)
+
+
+def aggregate_bars(base, interval):
+    """
+    Aggregate base bars into a coarser interval
+
+    Intraday bars are anchored at the NSE session open (see session_bars).
+
+    Args:
+        base: DataFrame with OHLCV columns
+        interval: Target interval
+
+    Returns:
+        DataFrame with one row per target bar
+    """
+    return aggregate_session_bars(base, interval)
+
+
+class BarRollup:
+    """Derives coarser bars from a base series, updating only the bins that changed"""
+
+    def __init__(self):
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derive(self, symbol, base, interval):
+        """
+        Get bars of a coarser interval built from the base series
+
+        When the base series only grew or had its last bars replaced since
+        the previous call, only the bins from the last processed base bar
+        onwards are rebuilt.
+
+        Args:
+            symbol: Stock symbol
+            base: DataFrame with base OHLCV bars
+            interval: Target interval
+
+        Returns:
+            DataFrame with derived OHLCV bars
+        """
+        key = (symbol, interval)
+
+        with self._lock:
+            entry = self._derived.get(key)
+
+        if base.empty:
+            return aggregate_bars(base, interval)
+
+        if (entry is None or base.index[0] != entry['base_first']
+                or base.index[-1] < entry['base_last']):
+            derived = aggregate_bars(base, interval)
+        else:
+            # The last processed base bar may have been replaced, so rebuild its bin too
+            resume_from = bin_labels(pd.DatetimeIndex([entry['base_last']]), interval)[0]
+            tail = aggregate_bars(base[bin_labels(base.index, interval) >= resume_from], interval)
+            previous = entry['data']
+            derived = pd.concat([previous[previous.index < resume_from], tail])
+
+        with self._lock:
+            self._derived[key] = {
+                'data': derived,
+                'base_first': base.index[0],
+                'base_last': base.index[-1]
+            }
+
+        return derived
+
+    def invalidate(self, symbol):
+        """Drop the derived series of a symbol, e.g. after its history was re-adjusted"""
+        with self._lock:
+            for key in [key for key in self._derived if key[0] == symbol]:
+                del self._derived[key]
+
+    def clear(self):
+        """Drop all derived series"""
+        with self._lock:
+            self._derived.clear()
+
+
+_bar_rollup = BarRollup()
+
+
+def get_bar_rollup():
+    """Get the process-wide bar rollup"""
+    return _bar_rollup
@@ -0,0 +1,75 @@
+import os
+from datetime import timedelta
+from utils.market_calendar import get_ist_time, next_bar_close, previous_bar_close
+
+
+class BarCloseScheduler:
+    """
+    Schedules scanners on the NSE bar closes of their timeframe
+
+    A scanner is due once a bar of its interval has closed since it last
+    ran, so 15m scanners run every 15 minutes of the session, 4h scanners
+    at 13:15 and 15:30 and daily scanners after the 15:30 close. Each run
+    waits settle_seconds past the close so the data source has published
+    the completed bar; the scan's own fetch then picks up exactly that bar.
+    """
+
+    def __init__(self, timeframes, settle_seconds=20):
+        """
+        Args:
+            timeframes: Dict with scanner name as key and bar interval as value
+            settle_seconds: Seconds to wait after a bar close before running
+        """
+        self.timeframes = dict(timeframes)
+        self.settle = timedelta(seconds=settle_seconds)
+
+    def due(self, last_runs, names=None, now=None):
+        """
+        Get the scanners whose timeframe closed a bar since they last ran
+
+        Args:
+            last_runs: Dict with scanner name as key and last run time as value
+            names: Scanners to consider (defaults to all)
+            now: tz-aware datetime (defaults to current IST time)
+
+        Returns:
+            List of scanner names in timeframes order
+        """
+        now = now or get_ist_time()
+        names = self.timeframes if names is None else names
+        due = []
+
+        for name in names:
+            last_run = last_runs.get(name)
+
+            if last_run is None:
+                due.append(name)
+                continue
+
+            bar_close = previous_bar_close(self.timeframes[name], now - self.settle)
+            if bar_close is not None and last_run < bar_close + self.settle:
+                due.append(name)
+
+        return due
+
+    def next_run(self, names=None, now=None):
+        """
+        Get the time the next scanner becomes due
+
+        Args:
+            names: Scanners to consider (defaults to all)
+            now: tz-aware datetime (defaults to current IST time)
+
+        Returns:
+            tz-aware IST datetime, or None if no scanner is considered
+        """
+        now = now or get_ist_time()
+        names = self.timeframes if names is None else names
+
+        runs = [next_bar_close(self.timeframes[name], now - self.settle) + self.settle for name in names]
+
+        return min(runs) if runs else None
+
+
+# Delay after each bar close is configurable through the environment
+SETTLE_SECONDS = int(os.environ.get('NSE_SCREENER_SCAN_SETTLE', '20'))
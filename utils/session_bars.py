@@ -0,0 +1,111 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from utils.market_calendar import IST, SESSION_OPEN, SESSION_CLOSE, interval_minutes
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+@lru_cache(maxsize=64)
+def session_bin_edges(first_day, last_day, interval):
+    """
+    Get the start of every bar from first_day to last_day
+
+    Intraday bars are anchored at the 09:15 IST session open, so a 4h
+    session always splits into 09:15-13:15 and 13:15-15:30. Daily bars
+    start at midnight. Results are cached per calendar range.
+
+    Args:
+        first_day: First calendar date (datetime.date)
+        last_day: Last calendar date (datetime.date)
+        interval: Target interval ('4h', '1h', '1d', ...)
+
+    Returns:
+        Sorted int64 array of bar starts in epoch nanoseconds (UTC)
+    """
+    days = pd.date_range(first_day, last_day, freq='D').as_unit('ns').asi8
+    minutes = interval_minutes(interval)
+
+    if minutes is None:
+        offsets = np.array([0], dtype=np.int64)
+    else:
+        session_open = SESSION_OPEN.hour * 60 + SESSION_OPEN.minute
+        session_close = SESSION_CLOSE.hour * 60 + SESSION_CLOSE.minute
+        offsets = np.arange(session_open, session_close, minutes, dtype=np.int64)
+
+    local = (days[:, None] + offsets[None, :] * 60_000_000_000).ravel()
+
+    # IST has no daylight saving, so local wall time is a fixed offset from UTC
+    utc_offset = int(IST.utcoffset(pd.Timestamp(first_day).to_pydatetime()).total_seconds()) * 1_000_000_000
+    return local - utc_offset
+
+
+def session_bin_index(index, interval):
+    """
+    Get the bar number each timestamp falls into
+
+    Args:
+        index: tz-aware DatetimeIndex of base bars
+        interval: Target interval
+
+    Returns:
+        Tuple of (bin ids as int64 array, bin start edges as int64 array)
+    """
+    local = index.tz_convert(IST)
+    edges = session_bin_edges(local[0].date(), local[-1].date(), interval)
+    ids = np.searchsorted(edges, index.as_unit('ns').asi8, side='right') - 1
+
+    # Pre-open bars on the first day join the first bar
+    return np.maximum(ids, 0), edges
+
+
+def session_bin_labels(index, interval):
+    """
+    Get the start label of the bar each timestamp belongs to
+
+    Args:
+        index: tz-aware DatetimeIndex of base bars
+        interval: Target interval
+
+    Returns:
+        DatetimeIndex of bar start labels in the index's timezone, same length as index
+    """
+    if len(index) == 0:
+        return index
+
+    ids, edges = session_bin_index(index, interval)
+    return pd.to_datetime(edges[ids], utc=True).tz_convert(index.tz)
+
+
+def aggregate_session_bars(base, interval):
+    """
+    Aggregate time-sorted base bars into session-anchored bars
+
+    Uses grouped NumPy reductions over contiguous runs of the same bin:
+    first open, max high, min low, last close and summed volume.
+
+    Args:
+        base: DataFrame with OHLCV columns and a tz-aware DatetimeIndex
+        interval: Target interval
+
+    Returns:
+        DataFrame with one row per non-empty bar, indexed by bar start
+    """
+    base = base[PRICE_COLUMNS].dropna()
+
+    if base.empty:
+        return base
+
+    ids, edges = session_bin_index(base.index, interval)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(ids)) + 1))
+    ends = np.append(starts[1:], len(ids)) - 1
+
+    index = pd.to_datetime(edges[ids[starts]], utc=True).tz_convert(base.index.tz)
+
+    return pd.DataFrame({
+        'Open': base['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(base['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(base['Low'].to_numpy(), starts),
+        'Close': base['Close'].to_numpy()[ends],
+        'Volume': np.add.reduceat(base['Volume'].to_numpy(), starts)
+    }, index=index)
@@ -0,0 +1,76 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ShardRunner:
+    """
+    Runs a scan over a symbol universe in parallel shards
+
+    Each shard fetches its bars through DataFetcher (which queues
+    requests on the shared fetch executor) and then evaluates them, so
+    one shard's computation overlaps with the next shard's downloads.
+    Shards run on their own pool: shard tasks wait on fetch executor
+    tasks, and running them on that same pool could deadlock it.
+    """
+
+    def __init__(self, max_workers=4, shard_size=200):
+        """
+        Args:
+            max_workers: Number of shards processed at once
+            shard_size: Maximum number of symbols per shard
+        """
+        self.max_workers = max_workers
+        self.shard_size = shard_size
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scan-shard')
+
+    def shards(self, symbols):
+        """
+        Split symbols into shards
+
+        Args:
+            symbols: List of symbols
+
+        Returns:
+            List of symbol lists of at most shard_size each
+        """
+        return [symbols[start:start + self.shard_size] for start in range(0, len(symbols), self.shard_size)]
+
+    def run(self, symbols, scan_shard):
+        """
+        Scan every shard and combine the results
+
+        Args:
+            symbols: List of symbols
+            scan_shard: Callable taking a list of symbols and returning a
+                        list of result rows
+
+        Returns:
+            List of result rows in symbol order
+        """
+        shards = self.shards(symbols)
+
+        if len(shards) <= 1:
+            return scan_shard(symbols) if symbols else []
+
+        futures = [self._pool.submit(scan_shard, shard) for shard in shards]
+        results = []
+
+        for shard, future in zip(shards, futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                print(f"Error scanning shard starting at {shard[0]}: {e}")
+
+        return results
+
+
+# Shard count and size are configurable through the environment
+_shard_runner = ShardRunner(
+    max_workers=int(os.environ.get('NSE_SCREENER_SCAN_WORKERS', '4')),
+    shard_size=int(os.environ.get('NSE_SCREENER_SHARD_SIZE', '200'))
+)
+
+
+def get_shard_runner():
+    """Get the process-wide shard runner"""
+    return _shard_runner
@@ -0,0 +1,404 @@
+import math
+import threading
+from collections import deque
+import numpy as np
+
+
+class StreamingIndicator:
+    """
+    Base class for indicators updated one bar at a time
+
+    update() appends a closed bar; revise() replaces the value of the last
+    bar, which is how the in-progress bar is followed while it forms. The
+    state before the last bar is kept, so a revision rolls back to it and
+    reapplies the new value instead of stacking on the old one.
+    """
+
+    def __init__(self):
+        self._previous = None
+        self.count = 0
+
+    def update(self, *bar):
+        """
+        Add a new bar
+
+        Returns:
+            Indicator value at the new bar (NaN while warming up)
+        """
+        self._previous = self._get_state()
+        self.count += 1
+        return self._apply(False, *bar)
+
+    def revise(self, *bar):
+        """
+        Replace the last bar, e.g. the in-progress bar with a newer quote
+
+        Returns:
+            Indicator value at the revised bar
+        """
+        if self._previous is None:
+            return self.update(*bar)
+
+        self._set_state(self._previous)
+        return self._apply(True, *bar)
+
+    def _get_state(self):
+        raise NotImplementedError
+
+    def _set_state(self, state):
+        raise NotImplementedError
+
+    def _apply(self, revising, *bar):
+        """Apply a bar to the state; revising is True when it replaces the last bar"""
+        raise NotImplementedError
+
+
+class SeededEMA(StreamingIndicator):
+    """
+    EMA seeded with the first value, exactly like Google Apps Script
+
+    Same arithmetic as MACDScannerOriginal.calculate_ema, so every value is
+    bit-identical to the list-based version.
+    """
+
+    def __init__(self, period):
+        super().__init__()
+        self.k = 2 / (period + 1)
+        self.value = math.nan
+
+    def _get_state(self):
+        return self.value
+
+    def _set_state(self, state):
+        self.value = state
+
+    def _apply(self, revising, x):
+        # Only the first bar seeds; a NaN later propagates, as in the list version
+        if self.count == 1:
+            self.value = x
+        else:
+            self.value = x * self.k + self._previous * (1 - self.k)
+        return self.value
+
+
+class EMA(StreamingIndicator):
+    """
+    EMA identical to pandas ewm(span=period).mean() (adjust=True)
+
+    Keeps the running weighted average and the total weight of past bars,
+    updated in the same order of operations as pandas' ewma kernel. NaN bars
+    after the first value decay the weights and repeat the previous value
+    (ignore_na=False).
+    """
+
+    def __init__(self, period):
+        super().__init__()
+        self.decay = 1. - 1. / (1. + (period - 1) / 2.)
+        self.value = math.nan
+        self.weight = 0.
+
+    def _get_state(self):
+        return self.value, self.weight
+
+    def _set_state(self, state):
+        self.value, self.weight = state
+
+    def _apply(self, revising, x):
+        if math.isnan(self.value):
+            if not math.isnan(x):
+                self.value = x
+                self.weight = 1.
+            return self.value
+
+        self.weight *= self.decay
+        if not math.isnan(x):
+            # pandas skips the update on a constant series to avoid rounding drift
+            if self.value != x:
+                self.value = (self.weight * self.value + x) / (self.weight + 1.)
+            self.weight += 1.
+        return self.value
+
+
+class RollingMean(StreamingIndicator):
+    """
+    Trailing mean identical to pandas rolling(window).mean()
+
+    Mirrors pandas' running-sum kernel: Kahan-compensated sums for added and
+    removed values, the sign clamp and the exact value for runs of equal
+    values. The sum runs over the whole history, so results depend on every
+    bar since the first, just as in the batch version.
+    """
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        # One bar beyond the window is kept: the one to remove next
+        self._values = deque(maxlen=window + 1)
+        self._sum = 0.
+        self._add_compensation = 0.
+        self._remove_compensation = 0.
+        self._nobs = 0
+        self._negatives = 0
+        self._same_run = 0
+        self._last_value = math.nan
+        self.value = math.nan
+
+    def _get_state(self):
+        return (self._sum, self._add_compensation, self._remove_compensation,
+                self._nobs, self._negatives, self._same_run, self._last_value, self.value)
+
+    def _set_state(self, state):
+        (self._sum, self._add_compensation, self._remove_compensation,
+         self._nobs, self._negatives, self._same_run, self._last_value, self.value) = state
+        self._values.pop()
+
+    def _apply(self, revising, x):
+        self._values.append(x)
+
+        if self.count == 1:
+            self._last_value = x
+        elif len(self._values) > self.window:
+            self._remove(self._values[0])
+            if self.window == 1:
+                # pandas restarts the sums whenever the window holds no old bar
+                self._sum = self._add_compensation = self._remove_compensation = 0.
+                self._nobs = self._negatives = self._same_run = 0
+                self._last_value = x
+        self._add(x)
+
+        if self._nobs < self.window:
+            self.value = math.nan
+        elif self._same_run >= self._nobs:
+            self.value = self._last_value
+        else:
+            self.value = self._sum / self._nobs
+            if self._negatives == 0 and self.value < 0:
+                self.value = 0.
+            elif self._negatives == self._nobs and self.value > 0:
+                self.value = 0.
+
+        return self.value
+
+    def _add(self, x):
+        if math.isnan(x):
+            return
+        self._nobs += 1
+        y = x - self._add_compensation
+        t = self._sum + y
+        self._add_compensation = t - self._sum - y
+        self._sum = t
+        if math.copysign(1., x) < 0:
+            self._negatives += 1
+        if x == self._last_value:
+            self._same_run += 1
+        else:
+            self._same_run = 1
+        self._last_value = x
+
+    def _remove(self, x):
+        if math.isnan(x):
+            return
+        self._nobs -= 1
+        y = -x - self._remove_compensation
+        t = self._sum + y
+        self._remove_compensation = t - self._sum - y
+        self._sum = t
+        if math.copysign(1., x) < 0:
+            self._negatives -= 1
+
+
+class MACD(StreamingIndicator):
+    """
+    MACD, Signal and Histogram one bar at a time
+
+    With seeded=False the EMAs match TechnicalIndicators.calculate_macd
+    (pandas ewm); with seeded=True they match the Google Apps Script
+    version in MACDScannerOriginal.calculate_macd.
+    """
+
+    def __init__(self, fast=12, slow=26, signal=9, seeded=False):
+        super().__init__()
+        ema = SeededEMA if seeded else EMA
+        self.fast = ema(fast)
+        self.slow = ema(slow)
+        self.signal = ema(signal)
+        self.value = (math.nan, math.nan, math.nan)
+
+    def _get_state(self):
+        return self.value
+
+    def _set_state(self, state):
+        self.value = state
+
+    def _apply(self, revising, close):
+        macd_line = _step(self.fast, revising, close) - _step(self.slow, revising, close)
+        signal_line = _step(self.signal, revising, macd_line)
+
+        self.value = (macd_line, signal_line, macd_line - signal_line)
+        return self.value
+
+
+class ATR(StreamingIndicator):
+    """Average True Range identical to TechnicalIndicators.calculate_atr"""
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.mean = RollingMean(period)
+        self.previous_close = math.nan
+        self.close = math.nan
+
+    def _get_state(self):
+        return self.previous_close, self.close
+
+    def _set_state(self, state):
+        self.previous_close, self.close = state
+
+    def _apply(self, revising, high, low, close):
+        self.previous_close, self.close = self.close, close
+
+        # NaN components are skipped, like DataFrame.max(axis=1)
+        ranges = [r for r in (high - low, abs(high - self.previous_close), abs(low - self.previous_close))
+                  if not math.isnan(r)]
+        true_range = max(ranges) if ranges else math.nan
+
+        return _step(self.mean, revising, true_range)
+
+
+class RSI(StreamingIndicator):
+    """RSI with simple moving averages, identical to TechnicalIndicators.calculate_rsi"""
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.gain = RollingMean(period)
+        self.loss = RollingMean(period)
+        self.close = math.nan
+        self.value = math.nan
+
+    def _get_state(self):
+        return self.close, self.value
+
+    def _set_state(self, state):
+        self.close, self.value = state
+
+    def _apply(self, revising, close):
+        delta = close - self.close
+        self.close = close
+
+        # Same values as delta.where(delta > 0, 0) and -delta.where(delta < 0, 0),
+        # including the negative zeros of the loss series
+        average_gain = _step(self.gain, revising, delta if delta > 0 else 0.)
+        average_loss = _step(self.loss, revising, -(delta if delta < 0 else 0.))
+
+        if average_loss == 0:
+            rs = math.copysign(math.inf, average_loss) if average_gain > 0 else math.nan
+        else:
+            rs = average_gain / average_loss
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class _Stream:
+    """Indicator state of one series and the bars it has seen"""
+
+    __slots__ = ('indicator', 'anchor', 'last_timestamp', 'values')
+
+    def __init__(self, indicator, anchor, keep):
+        self.indicator = indicator
+        self.anchor = anchor
+        self.last_timestamp = None
+        self.values = deque(maxlen=keep)
+
+
+class IndicatorStreams:
+    """
+    Streaming indicator state per (symbol, interval), kept in step with the bars
+
+    Each sync compares the series with the bars the state has seen. Bars
+    before the last one are treated as final (the bar store only ever
+    replaces the last, possibly forming, bar), so the last seen bar is
+    revised and newer bars are added, which costs O(1) per bar instead of a
+    pass over the whole history. The batch indicators start from the first
+    bar of the series, so when that moves (the period window rolled to a new
+    day) or the series no longer lines up, the state is rebuilt from scratch
+    to keep results identical to the batch versions.
+    """
+
+    def __init__(self):
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def sync(self, symbol, interval, data, name, factory, columns=('Close',), keep=2):
+        """
+        Bring an indicator up to date with a series and get its latest values
+
+        Args:
+            symbol: Stock symbol
+            interval: Data interval
+            data: OHLCV DataFrame, the same bars the batch version would get
+            name: Indicator name, part of the key (e.g. 'macd')
+            factory: Callable returning a new StreamingIndicator
+            columns: Columns passed to update() for every bar
+            keep: Number of trailing values to return
+
+        Returns:
+            List with the indicator values of the last `keep` bars, oldest first
+        """
+        if data is None or data.empty:
+            return []
+
+        key = (symbol, interval, name)
+        index = data.index
+
+        # Take the state out while updating it, so parallel shards never share one
+        with self._lock:
+            stream = self._streams.pop(key, None)
+
+        start = 0
+        if stream is not None and stream.anchor == index[0] and stream.values.maxlen == keep:
+            position = stream.indicator.count - 1
+            if position < len(index) and index[position] == stream.last_timestamp:
+                start = position
+            else:
+                stream = None
+        else:
+            stream = None
+
+        resume = stream is not None
+        if not resume:
+            stream = _Stream(factory(), index[0], keep)
+
+        rows = zip(*(data[column].to_numpy(dtype=np.float64)[start:].tolist() for column in columns))
+        if resume:
+            stream.values[-1] = stream.indicator.revise(*next(rows))
+        for row in rows:
+            stream.values.append(stream.indicator.update(*row))
+        stream.last_timestamp = index[-1]
+
+        with self._lock:
+            self._streams[key] = stream
+
+        return list(stream.values)
+
+    def invalidate(self, symbol):
+        """Drop the indicator state of a symbol, e.g. after its history was re-adjusted"""
+        with self._lock:
+            for key in [key for key in self._streams if key[0] == symbol]:
+                del self._streams[key]
+
+    def clear(self):
+        """Drop all indicator state"""
+        with self._lock:
+            self._streams.clear()
+
+
+_indicator_streams = IndicatorStreams()
+
+
+def get_indicator_streams():
+    """Get the process-wide streaming indicator state"""
+    return _indicator_streams
+
+
+def _step(indicator, revising, *bar):
+    """Update or revise a component indicator along with its owner"""
+    return indicator.revise(*bar) if revising else indicator.update(*bar)
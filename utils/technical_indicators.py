@@ -1,10 +1,19 @@
 import pandas as pd
 import numpy as np
+from utils.indicator_cache import memoized
+from utils.rolling_extrema import rolling_max, rolling_min
 
 class TechnicalIndicators:
-    """Technical indicators calculations for stock analysis"""
+    """
+    Technical indicators calculations for stock analysis
+    
+    Results are memoized on the content of the input series and the
+    parameters (see utils.indicator_cache), so recomputing an indicator on
+    an unchanged series is a cache lookup.
+    """
     
     @staticmethod
+    @memoized
     def calculate_macd(price_series, fast=12, slow=26, signal=9):
         """
         Calculate MACD (Moving Average Convergence Divergence)
@@ -43,6 +52,7 @@ class TechnicalIndicators:
             return pd.DataFrame()
     
     @staticmethod
+    @memoized
     def calculate_atr(data, period=14):
         """
         Calculate Average True Range (ATR)
@@ -77,6 +87,7 @@ class TechnicalIndicators:
             return pd.Series()
     
     @staticmethod
+    @memoized
     def calculate_sma(price_series, period):
         """
         Calculate Simple Moving Average
@@ -95,6 +106,7 @@ class TechnicalIndicators:
             return pd.Series()
     
     @staticmethod
+    @memoized
     def calculate_ema(price_series, period):
         """
         Calculate Exponential Moving Average
@@ -113,6 +125,7 @@ class TechnicalIndicators:
             return pd.Series()
     
     @staticmethod
+    @memoized
     def calculate_rsi(price_series, period=14):
         """
         Calculate Relative Strength Index (RSI)
@@ -139,6 +152,7 @@ class TechnicalIndicators:
             return pd.Series()
     
     @staticmethod
+    @memoized
     def calculate_bollinger_bands(price_series, period=20, std_dev=2):
         """
         Calculate Bollinger Bands
@@ -169,6 +183,7 @@ class TechnicalIndicators:
             return pd.DataFrame()
     
     @staticmethod
+    @memoized
     def calculate_stochastic(data, k_period=14, d_period=3):
         """
         Calculate Stochastic Oscillator
@@ -182,8 +197,8 @@ class TechnicalIndicators:
             DataFrame with %K and %D values
         """
         try:
-            low_min = data['Low'].rolling(window=k_period).min()
-            high_max = data['High'].rolling(window=k_period).max()
+            low_min = pd.Series(rolling_min(data['Low'].to_numpy(dtype=np.float64), k_period), index=data.index)
+            high_max = pd.Series(rolling_max(data['High'].to_numpy(dtype=np.float64), k_period), index=data.index)
             
             k_percent = 100 * ((data['Close'] - low_min) / (high_max - low_min))
             d_percent = k_percent.rolling(window=d_period).mean()
@@ -198,6 +213,7 @@ class TechnicalIndicators:
             return pd.DataFrame()
     
     @staticmethod
+    @memoized
     def calculate_volume_sma(volume_series, period):
         """
         Calculate Volume Simple Moving Average
@@ -216,6 +232,7 @@ class TechnicalIndicators:
             return pd.Series()
     
     @staticmethod
+    @memoized
     def detect_support_resistance(data, window=20, min_touches=2):
         """
         Detect support and resistance levels
@@ -230,8 +247,8 @@ class TechnicalIndicators:
         """
         try:
             # Find local maxima and minima
-            highs = data['High'].rolling(window=window, center=True).max()
-            lows = data['Low'].rolling(window=window, center=True).min()
+            highs = rolling_max(data['High'].to_numpy(dtype=np.float64), window, center=True)
+            lows = rolling_min(data['Low'].to_numpy(dtype=np.float64), window, center=True)
             
             resistance_points = data['High'] == highs
             support_points = data['Low'] == lows
@@ -0,0 +1,89 @@
+import os
+import threading
+import pandas as pd
+
+# Bundled list; point NSE_SCREENER_UNIVERSE_FILE at NSE's EQUITY_L.csv (or any
+# CSV with a SYMBOL column) to scan the full equity segment
+DEFAULT_UNIVERSE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'data', 'nse_universe.csv')
+
+# Tier given to symbols whose file has no liquidity_tier column/value
+DEFAULT_LIQUIDITY_TIER = 3
+
+UNIVERSE_COLUMNS = ['symbol', 'sector', 'series', 'liquidity_tier']
+
+
+def load_universe(path):
+    """
+    Load a symbol universe from a CSV file
+
+    Column names are matched case-insensitively, so NSE's own EQUITY_L.csv
+    (SYMBOL, NAME OF COMPANY, SERIES, ...) loads as-is. Symbols without an
+    exchange suffix get '.NS'.
+
+    Args:
+        path: CSV file with a 'symbol' column and optional 'sector',
+              'series' and 'liquidity_tier' columns
+
+    Returns:
+        DataFrame with symbol, sector, series and liquidity_tier columns,
+        in file order with duplicates removed
+    """
+    data = pd.read_csv(path, dtype=str, skipinitialspace=True)
+    data.columns = [column.strip().lower().replace(' ', '_') for column in data.columns]
+
+    if 'symbol' not in data.columns:
+        raise ValueError(f"Universe file {path} has no symbol column")
+
+    symbols = data['symbol'].str.strip()
+    symbols = symbols.where(symbols.str.contains('.', regex=False), symbols + '.NS')
+
+    universe = pd.DataFrame({
+        'symbol': symbols,
+        'sector': data['sector'].fillna('').str.strip() if 'sector' in data.columns else '',
+        'series': data['series'].fillna('EQ').str.strip() if 'series' in data.columns else 'EQ',
+        'liquidity_tier': (
+            pd.to_numeric(data['liquidity_tier'], errors='coerce') if 'liquidity_tier' in data.columns
+            else pd.Series(float('nan'), index=data.index)
+        ).fillna(DEFAULT_LIQUIDITY_TIER).astype(int)
+    })
+
+    universe = universe[universe['symbol'].str.len() > 3]
+    return universe.drop_duplicates('symbol').reset_index(drop=True)[UNIVERSE_COLUMNS]
+
+
+_universe = None
+_universe_key = None
+_universe_lock = threading.Lock()
+
+
+def get_universe():
+    """
+    Get the process-wide symbol universe
+
+    The file named by NSE_SCREENER_UNIVERSE_FILE (default data/nse_universe.csv)
+    is reloaded when it changes on disk.
+
+    Returns:
+        DataFrame as returned by load_universe, or None if the file is
+        missing or unreadable
+    """
+    global _universe, _universe_key
+
+    path = os.environ.get('NSE_SCREENER_UNIVERSE_FILE', DEFAULT_UNIVERSE_FILE)
+
+    try:
+        key = (path, os.path.getmtime(path))
+    except OSError:
+        return None
+
+    with _universe_lock:
+        if key != _universe_key:
+            try:
+                _universe = load_universe(path)
+                _universe_key = key
+            except Exception as e:
+                print(f"Error loading symbol universe from {path}: {e}")
+                return None
+
+        return _universe